@@ -0,0 +1,114 @@
+import argparse
+import io
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from benchmarks.common import LINE
+from src import follow
+
+
+class CountingSink(io.RawIOBase):
+    """Binary sink counting received log lines (headers are not counted)"""
+
+    marker = LINE[:16]
+
+    def __init__(self):
+        self.lines = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.lines += bytes(data).count(self.marker)
+        return len(data)
+
+
+def append_lines(paths, rate: int, duration: float) -> int:
+    """
+    Append lines to files round-robin at given total rate (lines/s)
+    return: number of lines actually written
+    """
+    batch_interval = 0.01
+    batch_lines = max(1, int(rate * batch_interval / len(paths)))
+    batch = LINE * batch_lines
+    files = [open(p, "ab", buffering=0) for p in paths]
+    appended = 0
+    start_time = time.perf_counter()
+    next_time = start_time
+    while time.perf_counter() - start_time < duration:
+        for f in files:
+            f.write(batch)
+            appended += batch_lines
+        next_time += batch_interval
+        time.sleep(max(0.0, next_time - time.perf_counter()))
+    for f in files:
+        f.close()
+    return appended
+
+
+def run(n_files: int, rate: int, duration: float, watcher_factory) -> dict:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = [Path(tmp_dir) / f"service_{i}.log" for i in range(n_files)]
+        for p in paths:
+            p.touch()
+
+        sink = CountingSink()
+        output = io.TextIOWrapper(io.BufferedWriter(sink))
+        stop_event = threading.Event()
+        follow.create_watcher = watcher_factory
+        follower = threading.Thread(
+            target=follow.follow_files,
+            kwargs=dict(
+                filenames=[str(p) for p in paths],
+                by_name=True,
+                n_lines=0,
+                output=output,
+                stop_event=stop_event,
+            ),
+        )
+        follower.start()
+        time.sleep(0.1)
+
+        start_time = time.perf_counter()
+        appended = append_lines(paths, rate, duration)
+        written_time = time.perf_counter()
+        # Wait until follower catches up, but not forever if it lost lines
+        while sink.lines < appended and time.perf_counter() - written_time < duration:
+            time.sleep(0.01)
+        caught_up_time = time.perf_counter()
+        elapsed = caught_up_time - start_time
+        stop_event.set()
+        follower.join()
+
+    return dict(
+        appended=appended,
+        received=sink.lines,
+        lag=caught_up_time - written_time,
+        throughput=appended / elapsed,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Follow mode throughput benchmark")
+    parser.add_argument("--files", type=int, default=32, help="Number of log files")
+    parser.add_argument("--rate", type=int, default=100_000, help="Lines per second")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds")
+    args = parser.parse_args()
+
+    print(f"files={args.files}, rate={args.rate} lines/s, duration={args.duration}s")
+    print("-" * 60)
+    for name, factory in [
+        ("inotify", follow.create_watcher),
+        ("poll", follow.PollWatcher),
+    ]:
+        stats = run(args.files, args.rate, args.duration, factory)
+        print(
+            f"{name:>8}: received {stats['received']}/{stats['appended']} lines, "
+            f"{stats['throughput']:.0f} lines/s, catch-up lag {stats['lag']:.3f} s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import argparse
+import tempfile
+from itertools import islice
+from pathlib import Path
+
+from benchmarks.common import LINE, generate_text_file, measure
+from src.line_index import LineIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Line index benchmark")
+    parser.add_argument(
+        "--size-gb", type=float, default=1.0, help="Size of generated input file"
+    )
+    parser.add_argument("-k", type=int, default=1000, help="Lines per query")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fpath = generate_text_file(
+            Path(tmp_dir) / "input.log", int(args.size_gb * 1024**3)
+        )
+        filename = str(fpath)
+        print(f"Input: {fpath.stat().st_size / 1024**3:.2f} GB, k={args.k}")
+        print("-" * 60)
+
+        def query(index: LineIndex):
+            middle = index.n_lines() // 2
+            index.read_lines(middle, middle + args.k)
+            index.last_lines(args.k)
+            index.line_count()
+
+        def scan_range():
+            with open(filename, "rb") as f:
+                middle = sum(1 for _ in f) // 2
+                f.seek(0)
+                return list(islice(f, middle, middle + args.k))
+
+        def with_index():
+            with LineIndex(filename) as index:
+                query(index)
+
+        def append_and_query():
+            with open(filename, "ab") as f:
+                f.write(LINE * 10)
+            with_index()
+
+        for name, func in [
+            ("no index", scan_range),
+            ("build", with_index),
+            ("cached", with_index),
+            ("append", append_and_query),
+        ]:
+            elapsed, _ = measure(func, trace_memory=False)
+            print(f"{name:>10}: {elapsed:8.4f} s")
+
+
+if __name__ == "__main__":
+    main()
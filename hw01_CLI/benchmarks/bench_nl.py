@@ -0,0 +1,48 @@
+import argparse
+import contextlib
+import os
+import tempfile
+from pathlib import Path
+
+from benchmarks.common import generate_text_file, measure
+from src.nl import print_number_lines
+
+
+def nl_print_per_line(fpath: Path):
+    """Previous implementation: one print() per line"""
+    with open(fpath, "r") as f, open(os.devnull, "w") as devnull:
+        with contextlib.redirect_stdout(devnull):
+            for i, line in enumerate(f):
+                print(f"{i+1:6d}\t{line.rstrip()}")
+
+
+def nl_batched(fpath: Path, **options):
+    with open(fpath, "rb") as f, open(os.devnull, "wb") as devnull:
+        print_number_lines(f, output=devnull, **options)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare nl output paths")
+    parser.add_argument(
+        "--size-gb", type=float, default=0.5, help="Size of generated input file"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fpath = generate_text_file(
+            Path(tmp_dir) / "input.txt", int(args.size_gb * 1024**3)
+        )
+        print(f"Input: {fpath.stat().st_size / 1024**3:.2f} GB")
+        print("-" * 60)
+
+        for name, func in [
+            ("print", nl_print_per_line),
+            ("batched -ba", nl_batched),
+            ("batched -bt", lambda p: nl_batched(p, body_numbering="t")),
+        ]:
+            elapsed, _ = measure(lambda: func(fpath), trace_memory=False)
+            print(f"{name:>12}: {elapsed:8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
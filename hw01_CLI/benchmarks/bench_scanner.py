@@ -0,0 +1,47 @@
+import argparse
+import os
+import tempfile
+from pathlib import Path
+
+from benchmarks.common import generate_text_file, measure
+from src.nl import print_number_lines
+from src.scanner import scan_file
+from src.tail import get_last_n_lines
+from src.wc import count_stats
+
+
+def separate_passes(fpath: Path):
+    """wc, then tail, then nl: every tool reads the file on its own"""
+    with open(fpath, "rb") as f:
+        count_stats(f)
+    with open(fpath, "r") as f:
+        get_last_n_lines(f, 10)
+    with open(fpath, "rb") as f, open(os.devnull, "wb") as devnull:
+        print_number_lines(f, output=devnull)
+
+
+def single_pass(fpath: Path):
+    with open(os.devnull, "wb") as devnull:
+        scan_file(str(fpath), stats=True, last_lines=10, numbered_output=devnull)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="wc + tail + nl in one read")
+    parser.add_argument(
+        "--size-gb", type=float, default=1.0, help="Size of generated input file"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fpath = generate_text_file(
+            Path(tmp_dir) / "input.txt", int(args.size_gb * 1024**3)
+        )
+        print(f"Input: {fpath.stat().st_size / 1024**3:.2f} GB")
+        print("-" * 60)
+        for name, func in [("separate", separate_passes), ("single", single_pass)]:
+            elapsed, _ = measure(lambda: func(fpath), trace_memory=False)
+            print(f"{name:>10}: {elapsed:8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from typing import List
+
+TOOLS = ["nl", "tail", "wc"]
+
+
+def import_time_ms(module: str) -> float:
+    """Cumulative import time of module reported by python -X importtime"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # Lines look like "import time:  self [us] | cumulative | module"
+    for line in result.stderr.splitlines():
+        _, cumulative, name = (part.strip() for part in line.split("|"))
+        if name == module:
+            return int(cumulative) / 1000
+    raise RuntimeError(f"{module} not found in importtime output")
+
+
+def run_time_ms(args: List[str]) -> float:
+    start_time = time.perf_counter()
+    subprocess.run([sys.executable, *args], stdout=subprocess.DEVNULL, check=True)
+    return (time.perf_counter() - start_time) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CLI startup time benchmark")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per tool")
+    parser.add_argument(
+        "--threshold-ms",
+        type=float,
+        default=40.0,
+        help="Fail if median import time of any tool exceeds this",
+    )
+    args = parser.parse_args()
+
+    empty_run = statistics.median(
+        run_time_ms(["-c", "pass"]) for _ in range(args.repeat)
+    )
+    print(f"Interpreter startup: {empty_run:.1f} ms")
+    print(f"fire import: {import_time_ms('fire'):.1f} ms (not on the hot path)")
+    print("-" * 60)
+
+    failed = []
+    for tool in TOOLS:
+        module = f"src.{tool}"
+        import_ms = statistics.median(
+            import_time_ms(module) for _ in range(args.repeat)
+        )
+        run_ms = statistics.median(
+            run_time_ms(["-m", module, "inputs/zen_of_python.txt"])
+            for _ in range(args.repeat)
+        )
+        print(f"{tool:>5}: import {import_ms:6.1f} ms, run {run_ms:6.1f} ms")
+        if import_ms > args.threshold_ms:
+            failed.append(tool)
+
+    if failed:
+        print(f"Regression: import time above {args.threshold_ms} ms for {failed}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
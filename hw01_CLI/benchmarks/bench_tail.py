@@ -0,0 +1,48 @@
+import argparse
+import tempfile
+from pathlib import Path
+
+from benchmarks.common import generate_text_file, measure
+from src.tail import get_last_n_lines
+
+
+def tail_readlines(fpath: Path, n: int):
+    """Previous implementation: read the whole file into a list"""
+    with open(fpath, "r") as f:
+        return f.readlines()[-n:]
+
+
+def tail_backward(fpath: Path, n: int):
+    with open(fpath, "r") as f:
+        return get_last_n_lines(f, n)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare tail implementations")
+    parser.add_argument(
+        "--size-gb", type=float, default=1.0, help="Size of generated input file"
+    )
+    parser.add_argument("-n", type=int, default=10, help="Number of lines to tail")
+    parser.add_argument(
+        "--no-memory", action="store_true", help="Skip tracemalloc (faster timing)"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fpath = generate_text_file(
+            Path(tmp_dir) / "input.txt", int(args.size_gb * 1024**3)
+        )
+        print(f"Input: {fpath.stat().st_size / 1024**3:.2f} GB, n={args.n}")
+        print("-" * 60)
+
+        for name, func in [("readlines", tail_readlines), ("backward", tail_backward)]:
+            elapsed, peak = measure(
+                lambda: func(fpath, args.n), trace_memory=not args.no_memory
+            )
+            print(
+                f"{name:>10}: {elapsed:8.3f} s, peak memory {peak / 1024**2:10.2f} MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import argparse
+import tempfile
+from pathlib import Path
+
+from benchmarks.common import generate_text_file, measure
+from src.wc import FileStats, count_stats
+
+
+def count_stats_read_all(fpath: Path) -> FileStats:
+    """Previous implementation: decode the whole file, split and encode it again"""
+    with open(fpath, "r") as f:
+        content = f.read()
+    return FileStats(
+        lines=content.count("\n"),
+        words=len(content.split()),
+        bytes=len(content.encode()),
+    )
+
+
+def count_stats_chunked(fpath: Path) -> FileStats:
+    with open(fpath, "rb") as f:
+        return count_stats(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare wc implementations")
+    parser.add_argument(
+        "--size-gb", type=float, default=1.0, help="Size of generated input file"
+    )
+    parser.add_argument(
+        "--no-memory", action="store_true", help="Skip tracemalloc (faster timing)"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fpath = generate_text_file(
+            Path(tmp_dir) / "input.txt", int(args.size_gb * 1024**3)
+        )
+        print(f"Input: {fpath.stat().st_size / 1024**3:.2f} GB")
+        print("-" * 60)
+
+        for name, func in [
+            ("read all", count_stats_read_all),
+            ("chunked", count_stats_chunked),
+        ]:
+            elapsed, peak = measure(
+                lambda: print(f"{name:>10}: {func(fpath)}"),
+                trace_memory=not args.no_memory,
+            )
+            print(
+                f"{name:>10}: {elapsed:8.3f} s, peak memory {peak / 1024**2:10.2f} MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
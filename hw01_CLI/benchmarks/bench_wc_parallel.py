@@ -0,0 +1,59 @@
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.common import generate_text_file
+from src.wc import count_files_parallel, count_stats
+
+
+def count_sequential(filenames):
+    stats = []
+    for filename in filenames:
+        with open(filename, "rb") as f:
+            stats.append(count_stats(f))
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="wc --jobs scaling benchmark")
+    parser.add_argument(
+        "--size-gb", type=float, default=2.0, help="Total size of generated input"
+    )
+    parser.add_argument(
+        "--files", type=int, default=1, help="Number of files to split input into"
+    )
+    parser.add_argument(
+        "--max-jobs", type=int, default=os.cpu_count(), help="Largest number of jobs"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_size = int(args.size_gb * 1024**3 / args.files)
+        filenames = [
+            str(generate_text_file(Path(tmp_dir) / f"input_{i}.txt", file_size))
+            for i in range(args.files)
+        ]
+        print(f"Input: {args.files} file(s), {args.size_gb:.2f} GB total")
+        print("-" * 60)
+
+        start_time = time.perf_counter()
+        expected = count_sequential(filenames)
+        base_time = time.perf_counter() - start_time
+        print(f"sequential: {base_time:8.3f} s")
+
+        for jobs in range(1, args.max_jobs + 1):
+            start_time = time.perf_counter()
+            stats = list(count_files_parallel(filenames, jobs))
+            elapsed = time.perf_counter() - start_time
+            assert [(s.lines, s.words, s.bytes) for s in stats] == [
+                (s.lines, s.words, s.bytes) for s in expected
+            ]
+            print(
+                f"jobs={jobs:3d}: {elapsed:8.3f} s, speedup {base_time / elapsed:5.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
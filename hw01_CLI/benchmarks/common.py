@@ -0,0 +1,32 @@
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Tuple
+
+LINE = b"Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod.\n"
+
+
+def generate_text_file(fpath: Path, size_bytes: int) -> Path:
+    """Write file of approximately size_bytes made of repeated text lines"""
+    fpath.parent.mkdir(parents=True, exist_ok=True)
+    chunk = LINE * (1024 * 1024 // len(LINE))
+    with open(fpath, "wb") as f:
+        written = 0
+        while written < size_bytes:
+            f.write(chunk)
+            written += len(chunk)
+    return fpath
+
+
+def measure(func: Callable[[], Any], trace_memory: bool = True) -> Tuple[float, int]:
+    """Run func once and return (elapsed seconds, peak traced memory in bytes)"""
+    if trace_memory:
+        tracemalloc.start()
+    start_time = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start_time
+    peak = 0
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return elapsed, peak
@@ -0,0 +1,124 @@
+"""
+Lightweight command line parsing for the tools.
+
+Importing fire takes longer than running the tools on small inputs, so regular
+invocations are parsed here, and fire is imported only to show help or to report
+usage errors.
+"""
+
+import sys
+from typing import Callable, Dict, List, Optional, Tuple
+
+HELP_FLAGS = ("-h", "--help")
+FALSE_VALUES = ("false", "0", "no")
+TRUE_VALUES = ("true", "1", "yes")
+
+
+class UsageError(Exception):
+    pass
+
+
+class InvalidValueError(UsageError):
+    """Known flag with a value its type rejects"""
+
+
+def expand_short_flags(args: List[str], short_flags: Dict[str, str]) -> List[str]:
+    """Translate GNU-style short options (-ba, -w 3) to long flags"""
+    expanded = []
+    for arg in args:
+        flag, value = arg[:2], arg[2:]
+        if flag in short_flags:
+            long_flag = f"--{short_flags[flag]}"
+            expanded.append(f"{long_flag}={value}" if value else long_flag)
+        else:
+            expanded.append(arg)
+    return expanded
+
+
+def convert_value(name: str, value: str, value_type: type):
+    if value_type is bool:
+        if value.lower() in TRUE_VALUES:
+            return True
+        if value.lower() in FALSE_VALUES:
+            return False
+        raise InvalidValueError(f"invalid value for --{name}: '{value}'")
+    try:
+        return value_type(value)
+    except ValueError as e:
+        raise InvalidValueError(f"invalid value for --{name}: '{value}'") from e
+
+
+def parse_args(args: List[str], options: Dict[str, type]) -> Tuple[List[str], Dict]:
+    """
+    Parse positional arguments and --name[=value] flags in fire style.
+    Bool options are flags: --follow, --nofollow, --follow=false.
+
+    options: Keyword parameters of the command with their value types
+    return: positional arguments and keyword arguments
+    """
+    positional: List[str] = []
+    kwargs = {}
+    args_iter = iter(args)
+    for arg in args_iter:
+        if arg == "--":
+            positional.extend(args_iter)
+            break
+        if not arg.startswith("--"):
+            if arg.startswith("-") and arg != "-":
+                raise UsageError(f"unknown flag: {arg}")
+            positional.append(arg)
+            continue
+
+        name, has_value, value = arg[2:].partition("=")
+        name = name.replace("-", "_")
+        if (
+            name not in options
+            and name.startswith("no")
+            and options.get(name[2:]) is bool
+        ):
+            if has_value:
+                raise UsageError(f"flag --{name} takes no value")
+            kwargs[name[2:]] = False
+            continue
+        if name not in options:
+            raise UsageError(f"unknown flag: --{name}")
+
+        value_type = options[name]
+        if not has_value:
+            if value_type is bool:
+                kwargs[name] = True
+                continue
+            value = next(args_iter, None)
+            if value is None:
+                raise UsageError(f"flag --{name} requires a value")
+        kwargs[name] = convert_value(name, value, value_type)
+    return positional, kwargs
+
+
+def run_cli(
+    command: Callable,
+    options: Dict[str, type],
+    short_flags: Optional[Dict[str, str]] = None,
+    args: Optional[List[str]] = None,
+):
+    """
+    Run command with parsed command line, fall back to fire for help and
+    unknown flags. Invalid values are reported here: fire would pass them on
+    as strings and the command would fail with a traceback.
+    """
+    args = sys.argv[1:] if args is None else args
+    args = expand_short_flags(args, short_flags or {})
+    try:
+        if any(arg in HELP_FLAGS for arg in args):
+            raise UsageError("help requested")
+        positional, kwargs = parse_args(args, options)
+    except InvalidValueError as e:
+        reason = f" ({e.__cause__})" if e.__cause__ else ""
+        print(f"ERROR: {e}{reason}", file=sys.stderr)
+        sys.exit(2)
+    except UsageError:
+        import fire
+
+        fire.Fire(command, command=args)
+        return
+    command(*positional, **kwargs)
@@ -0,0 +1,265 @@
+import ctypes
+import ctypes.util
+import os
+import selectors
+import struct
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import BinaryIO, Dict, List, Optional, TextIO
+
+from src.tail import BLOCK_SIZE, print_file_header, read_last_n_lines_seekable
+
+# inotify(7) event masks
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+
+FILE_EVENTS = IN_MODIFY | IN_ATTRIB | IN_DELETE_SELF | IN_MOVE_SELF
+DIR_EVENTS = IN_CREATE | IN_MOVED_TO | IN_MOVED_FROM | IN_DELETE
+EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+@dataclass
+class FollowedFile:
+    filename: str
+    stream: Optional[BinaryIO] = None
+    inode: Optional[tuple] = None
+    position: int = 0
+
+    def open(self, at_end: bool = False) -> bool:
+        """Open file by name, return False if it does not exist"""
+        try:
+            self.stream = open(self.filename, "rb", buffering=0)
+        except FileNotFoundError:
+            self.stream = None
+            return False
+        st = os.fstat(self.stream.fileno())
+        self.inode = (st.st_dev, st.st_ino)
+        self.position = self.stream.seek(0, os.SEEK_END) if at_end else 0
+        return True
+
+    def close(self):
+        if self.stream is not None:
+            self.stream.close()
+        self.stream = None
+        self.inode = None
+
+    def read_new(self) -> bytes:
+        """Read bytes appended since last read, restart from 0 on truncation"""
+        if self.stream is None:
+            return b""
+        size = os.fstat(self.stream.fileno()).st_size
+        if size < self.position:
+            print(f"tail: {self.filename}: file truncated", file=sys.stderr)
+            self.position = 0
+        if size == self.position:
+            return b""
+        self.stream.seek(self.position)
+        chunks = []
+        while chunk := self.stream.read(BLOCK_SIZE):
+            chunks.append(chunk)
+        data = b"".join(chunks)
+        self.position += len(data)
+        return data
+
+    def is_replaced(self) -> bool:
+        """Check whether the name now points to another file (or nothing)"""
+        try:
+            st = os.stat(self.filename)
+        except FileNotFoundError:
+            return True
+        return (st.st_dev, st.st_ino) != self.inode
+
+
+class PollWatcher:
+    """Fallback watcher: sleep between checks, backing off while files are idle"""
+
+    def __init__(self, min_interval: float = 0.001, max_interval: float = 1.0):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+
+    def watch(self, followed: FollowedFile):
+        pass
+
+    def wait(self, active: bool) -> Optional[List[FollowedFile]]:
+        """Wait for changes, return None meaning 'check every file'"""
+        if active:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * 2, self.max_interval)
+        time.sleep(self.interval)
+        return None
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Linux watcher: one inotify descriptor for all files, multiplexed by selectors"""
+
+    def __init__(self, recheck_interval: float = 1.0):
+        self.recheck_interval = recheck_interval
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._libc.inotify_add_watch.argtypes = [
+            ctypes.c_int,
+            ctypes.c_char_p,
+            ctypes.c_uint32,
+        ]
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._fd, selectors.EVENT_READ)
+        self._watches: Dict[int, List[FollowedFile]] = {}
+
+    def _add_watch(self, path: str, mask: int, followed: FollowedFile):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), mask)
+        if wd < 0:
+            return
+        files = self._watches.setdefault(wd, [])
+        if followed not in files:
+            files.append(followed)
+
+    def watch(self, followed: FollowedFile):
+        """Watch file itself and its directory (to notice rotation)"""
+        self._add_watch(followed.filename, FILE_EVENTS, followed)
+        dirname = os.path.dirname(followed.filename) or "."
+        self._add_watch(dirname, DIR_EVENTS, followed)
+
+    def wait(self, active: bool) -> Optional[List[FollowedFile]]:
+        """Block until inotify reports events, return affected files"""
+        if not self._selector.select(self.recheck_interval):
+            return None  # periodic full recheck
+        affected: List[FollowedFile] = []
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, _, _, name_len = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size + name_len
+                for followed in self._watches.get(wd, ()):
+                    if followed not in affected:
+                        affected.append(followed)
+        return affected
+
+    def close(self):
+        self._selector.close()
+        os.close(self._fd)
+
+
+def create_watcher():
+    """Use inotify when available, adaptive polling otherwise"""
+    try:
+        return InotifyWatcher()
+    except (OSError, AttributeError, TypeError):
+        return PollWatcher()
+
+
+@dataclass
+class FollowPrinter:
+    output: TextIO
+    show_headers: bool
+    last_filename: Optional[str] = field(default=None)
+
+    def write(self, followed: FollowedFile, data: bytes):
+        if self.show_headers and followed.filename != self.last_filename:
+            print_file_header(
+                followed.filename, self.last_filename is None, self.output
+            )
+        self.last_filename = followed.filename
+        self.output.flush()
+        self.output.buffer.write(data)
+        self.output.buffer.flush()
+
+
+def check_file(followed: FollowedFile, by_name: bool, printer: FollowPrinter) -> bool:
+    """Print new data of single file, handle rotation; return True if data was read"""
+    data = followed.read_new()
+    if by_name and followed.is_replaced():
+        data += followed.read_new()  # drain rest of the old file
+        was_open = followed.stream is not None
+        followed.close()
+        if followed.open():
+            state = "has been replaced" if was_open else "has appeared"
+            print(
+                f"tail: '{followed.filename}' {state};  following new file",
+                file=sys.stderr,
+            )
+            data += followed.read_new()
+        elif was_open:
+            print(
+                f"tail: '{followed.filename}' has become inaccessible",
+                file=sys.stderr,
+            )
+    if data:
+        printer.write(followed, data)
+    return bool(data)
+
+
+def follow_files(
+    filenames: List[str],
+    by_name: bool = False,
+    n_lines: int = 10,
+    output: Optional[TextIO] = None,
+    stop_event: Optional[threading.Event] = None,
+):
+    """
+    Print last n lines of each file, then output data appended to them.
+
+    Args:
+        filenames: Files to follow
+        by_name: Reopen file when it's rotated or recreated (tail -F)
+        n_lines: Number of lines printed before following
+        output: Text stream with binary buffer to write to, stdout by default
+        stop_event: Stop following when set
+    """
+    output = output or sys.stdout
+    printer = FollowPrinter(output, show_headers=len(filenames) > 1)
+    watcher = create_watcher()
+    followed_files = []
+
+    # Print initial snapshot from the same descriptors we follow
+    for i, filename in enumerate(filenames):
+        followed = FollowedFile(filename)
+        if not followed.open():
+            print(f"tail: cannot open '{filename}' for reading", file=sys.stderr)
+        else:
+            if printer.show_headers:
+                print_file_header(filename, is_first=(i == 0), file=output)
+            for line in read_last_n_lines_seekable(followed.stream, n_lines):
+                print(line.decode(errors="replace").rstrip(), file=output)
+            followed.position = followed.stream.tell()
+            printer.last_filename = filename
+        if followed.stream is not None or by_name:
+            watcher.watch(followed)
+            followed_files.append(followed)
+    output.flush()
+
+    try:
+        active = False
+        while followed_files and not (stop_event and stop_event.is_set()):
+            affected = watcher.wait(active)
+            active = False
+            for followed in followed_files if affected is None else affected:
+                inode = followed.inode
+                active |= check_file(followed, by_name, printer)
+                if followed.inode != inode and followed.inode is not None:
+                    watcher.watch(followed)  # new file under the same name
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+        for followed in followed_files:
+            followed.close()
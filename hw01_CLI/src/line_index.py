@@ -0,0 +1,193 @@
+import hashlib
+import mmap
+import os
+import struct
+from array import array
+from itertools import accumulate
+from typing import Optional, Tuple
+
+INDEX_SUFFIX = ".lineidx"
+MAGIC = b"LINEIDX3"
+# magic, inode, indexed size, mtime_ns, digest of the edges of indexed bytes
+HEADER = struct.Struct("<8sQQQ32s")
+SCAN_CHUNK = 16 * 1024 * 1024
+DIGEST_SPAN = 64 * 1024  # bytes hashed at each edge of the indexed part
+
+
+def scan_line_ends(mm: mmap.mmap, start: int, end: int) -> array:
+    """Offsets right after each b"\\n" in mm[start:end]"""
+    line_ends = array("Q")
+    while start < end:
+        parts = mm[start : min(start + SCAN_CHUNK, end)].split(b"\n")
+        tail = parts.pop()  # bytes after the last newline of the chunk
+        if not parts:
+            start += len(tail)
+            continue
+        ends = accumulate(map((1).__add__, map(len, parts)), initial=start)
+        next(ends)  # skip initial value
+        line_ends.extend(ends)
+        start = line_ends[-1]
+    return line_ends
+
+
+def edges_digest(mm: mmap.mmap, size: int) -> bytes:
+    """
+    Digest of the first and the last DIGEST_SPAN bytes of the first size bytes.
+    Costs the same whatever the size, so checking an index before extending
+    it doesn't take longer than indexing the appended lines.
+    """
+    digest = hashlib.blake2b(digest_size=32)
+    view = memoryview(mm)
+    digest.update(view[: min(DIGEST_SPAN, size)])
+    digest.update(view[max(DIGEST_SPAN, size - DIGEST_SPAN) : size])
+    view.release()
+    return digest.digest()
+
+
+class LineIndex:
+    """
+    Persistent index of line end offsets for append-only files.
+    Stored in sidecar file FILE.lineidx: header followed by array('Q') of offsets.
+    The sidecar is memory-mapped, so queries touch only the offsets they need.
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.index_filename = filename + INDEX_SUFFIX
+        self._file = open(filename, "rb")
+        st = os.fstat(self._file.fileno())
+        self.size = st.st_size
+        self._mm = (
+            mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if self.size
+            else None
+        )
+        self._index_mm: Optional[mmap.mmap] = None
+        self.line_ends = self._load_or_build(st)
+
+    def close(self):
+        self.line_ends.release()
+        self._close_index()
+        if self._mm is not None:
+            self._mm.close()
+        self._file.close()
+
+    def __enter__(self) -> "LineIndex":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _header(self, st: os.stat_result) -> bytes:
+        digest = edges_digest(self._mm, self.size) if self._mm else bytes(32)
+        return HEADER.pack(MAGIC, st.st_ino, self.size, st.st_mtime_ns, digest)
+
+    def _read_header(self) -> Optional[Tuple[int, int, int, bytes]]:
+        try:
+            with open(self.index_filename, "rb") as f:
+                raw = f.read(HEADER.size)
+                index_size = os.fstat(f.fileno()).st_size
+        except OSError:
+            return None
+        if len(raw) < HEADER.size or (index_size - HEADER.size) % 8:
+            return None
+        magic, inode, size, mtime_ns, digest = HEADER.unpack(raw)
+        return (inode, size, mtime_ns, digest) if magic == MAGIC else None
+
+    def _load_or_build(self, st: os.stat_result) -> memoryview:
+        """
+        Use sidecar if it is fresh, extend it if file only grew (edges of the
+        indexed part are unchanged), rebuild otherwise. Same-size rewrites
+        change mtime and are rebuilt; a rewrite inside the indexed part
+        followed by growth is only caught if it touches the edges, the index
+        is meant for append-only files.
+        """
+        header = self._read_header()
+        if header is not None:
+            inode, size, mtime_ns, digest = header
+            is_unchanged = size == self.size and mtime_ns == st.st_mtime_ns
+            if inode == st.st_ino and is_unchanged:
+                return self._map_index()
+            if (
+                inode == st.st_ino
+                and size < self.size
+                and edges_digest(self._mm, size) == digest
+            ):
+                # Data was appended: index only lines after the last known one
+                existing = self._map_index()
+                n_known = len(existing)
+                start = existing[-1] if n_known else 0
+                existing.release()
+                self._close_index()
+                return self._save(st, self._scan(start), n_known)
+        return self._save(st, self._scan(0))
+
+    def _scan(self, start: int) -> array:
+        return scan_line_ends(self._mm, start, self.size) if self._mm else array("Q")
+
+    def _save(
+        self, st: os.stat_result, line_ends: array, n_known: Optional[int] = None
+    ) -> memoryview:
+        """
+        Write sidecar, or append line_ends after n_known stored offsets.
+        If sidecar can't be written, keep the index in memory.
+        """
+        try:
+            with open(self.index_filename, "wb" if n_known is None else "r+b") as f:
+                f.truncate(HEADER.size + 8 * (n_known or 0))
+                f.seek(0, os.SEEK_END)
+                f.write(line_ends.tobytes())
+                f.seek(0)
+                f.write(self._header(st))
+        except OSError:
+            if n_known:
+                known = array("Q")
+                with open(self.index_filename, "rb") as f:
+                    f.seek(HEADER.size)
+                    known.frombytes(f.read(8 * n_known))
+                line_ends = known + line_ends
+            return memoryview(line_ends)
+        return self._map_index()
+
+    def _close_index(self):
+        if self._index_mm is not None:
+            self._index_mm.close()
+        self._index_mm = None
+
+    def _map_index(self) -> memoryview:
+        with open(self.index_filename, "rb") as f:
+            self._index_mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return memoryview(self._index_mm)[HEADER.size :].cast("Q")
+
+    def line_count(self) -> int:
+        """Number of newlines in file (same as wc -l)"""
+        return len(self.line_ends)
+
+    def n_lines(self) -> int:
+        """Number of lines including last line without trailing newline"""
+        n_complete = len(self.line_ends)
+        last_end = self.line_ends[-1] if n_complete else 0
+        return n_complete + (self.size > last_end)
+
+    def line_offset(self, i: int) -> int:
+        """Byte offset where 0-based line i starts"""
+        if i <= 0:
+            return 0
+        if i > len(self.line_ends):
+            return self.size
+        return self.line_ends[i - 1]
+
+    def read_lines(self, start: int, end: int) -> bytes:
+        """Bytes of 0-based lines [start, end)"""
+        if not self._mm:
+            return b""
+        start = max(0, start)
+        end = min(end, self.n_lines())
+        if start >= end:
+            return b""
+        return self._mm[self.line_offset(start) : self.line_offset(end)]
+
+    def last_lines(self, n: int) -> bytes:
+        """Bytes of last n lines"""
+        n_lines = self.n_lines()
+        return self.read_lines(n_lines - n, n_lines)
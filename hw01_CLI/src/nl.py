@@ -1,31 +1,127 @@
+import io
 import sys
-from typing import Optional, TextIO
+from itertools import islice
+from typing import BinaryIO, Optional
 
-import fire
+from src.cli import run_cli
+from src.scanner import NumberedLineWriter, line_selector, scan
 
+# GNU nl short options mapped to nl() parameters
+SHORT_FLAGS = {
+    "-f": "filename",
+    "-b": "body_numbering",
+    "-v": "starting_line_number",
+    "-i": "line_increment",
+    "-w": "number_width",
+    "-s": "number_separator",
+}
 
-def print_number_lines(input_stream: TextIO):
-    """Read lines from input stream and print them numbered"""
-    for i, line in enumerate(input_stream):
-        print(f"{i+1:6d}\t{line.rstrip()}")
 
+def body_numbering_style(value: str) -> str:
+    """Type of -b option: invalid style or regex raises ValueError"""
+    line_selector(value)
+    return value
 
-def nl(filename: Optional[str] = None):
+
+OPTIONS = {
+    "filename": str,
+    "body_numbering": body_numbering_style,
+    "starting_line_number": int,
+    "line_increment": int,
+    "number_width": int,
+    "number_separator": str,
+    "first_line": int,
+    "last_line": int,
+    "index": bool,
+}
+
+
+def print_number_lines(
+    input_stream: BinaryIO,
+    body_numbering: str = "a",
+    starting_line_number: int = 1,
+    line_increment: int = 1,
+    number_width: int = 6,
+    number_separator: str = "\t",
+    output: Optional[BinaryIO] = None,
+):
+    """
+    Read lines from binary input stream and print them numbered.
+    Lines are formatted in batches and written with one call per batch.
+    """
+    writer = NumberedLineWriter(
+        output,
+        body_numbering=body_numbering,
+        starting_line_number=starting_line_number,
+        line_increment=line_increment,
+        number_width=number_width,
+        number_separator=number_separator,
+    )
+    scan(input_stream, [writer])
+
+
+def nl(
+    filename: Optional[str] = None,
+    body_numbering: str = "a",
+    starting_line_number: int = 1,
+    line_increment: int = 1,
+    number_width: int = 6,
+    number_separator: str = "\t",
+    first_line: Optional[int] = None,
+    last_line: Optional[int] = None,
+    index: bool = False,
+):
     """
     Write each FILE to standard output, with line numbers added.
 
     Args:
         filename: Optional path to input file. If None, reads from stdin
+        body_numbering: Lines to number: a (all), t (nonempty), n (none),
+            pBRE (matching regex). Short flag -b
+        starting_line_number: First line number. Short flag -v
+        line_increment: Line number increment at each line. Short flag -i
+        number_width: Use number_width columns for line numbers. Short flag -w
+        number_separator: Add string after line number. Short flag -s
+        first_line: Print lines starting from this one (1-based, needs -b a)
+        last_line: Print lines up to this one inclusive (needs -b a)
+        index: Use (and create or update) FILE.lineidx line offsets index
+            to seek to first_line directly
     """
-    if filename:
-        with open(filename, "r") as f:
-            print_number_lines(f)
+    options = dict(
+        body_numbering=body_numbering,
+        starting_line_number=starting_line_number,
+        line_increment=line_increment,
+        number_width=number_width,
+        number_separator=str(number_separator),  # fire may parse "-s 1" as int
+    )
+    if first_line is None and last_line is None:
+        if filename:
+            with open(filename, "rb") as f:
+                print_number_lines(f, **options)
+        else:
+            print_number_lines(sys.stdin.buffer, **options)
+        return
+
+    # Numbers of selected lines are known upfront only when every line is numbered
+    if body_numbering != "a":
+        raise ValueError("first_line/last_line require body numbering 'a'")
+    start = max(1, first_line or 1) - 1
+    options["starting_line_number"] += start * line_increment
+
+    if index and filename:
+        from src.line_index import LineIndex
+
+        with LineIndex(filename) as line_index:
+            end = line_index.n_lines() if last_line is None else last_line
+            data = line_index.read_lines(start, end)
     else:
-        print_number_lines(sys.stdin)
+        with open(filename, "rb") if filename else sys.stdin.buffer as f:
+            data = b"".join(islice(f, start, last_line))
+    print_number_lines(io.BytesIO(data), **options)
 
 
 def nl_cli():
-    fire.Fire(nl)
+    run_cli(nl, OPTIONS, SHORT_FLAGS)
 
 
 if __name__ == "__main__":
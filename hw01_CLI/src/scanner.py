@@ -0,0 +1,313 @@
+"""
+Single-pass scanning core shared by nl, tail and wc.
+
+scan() reads a binary stream once in chunks and feeds every chunk to consumers.
+A consumer has update(chunk) and result() methods; chunks may be reused buffers,
+so consumers copy whatever they keep.
+"""
+
+import codecs
+import io
+import sys
+from collections import deque
+from itertools import chain, count, islice
+from typing import BinaryIO, List, NamedTuple, Optional, Union
+
+CHUNK_SIZE = 1024 * 1024
+
+# Maps ASCII whitespace (as understood by str.split()) to b" ", anything else to b"x"
+ASCII_WORDS_TABLE = bytes(
+    ord(" ") if chr(i).isspace() and i < 128 else ord("x") for i in range(256)
+)
+
+
+class FileStats:
+    # Plain class instead of a dataclass: dataclasses pulls in inspect and would
+    # nearly double import time of the tool (typing is most of the rest)
+    __slots__ = ("lines", "words", "bytes", "filename")
+
+    def __init__(
+        self, lines: int, words: int, bytes: int, filename: Optional[str] = None
+    ):
+        self.lines = lines
+        self.words = words
+        self.bytes = bytes
+        self.filename = filename
+
+    def __repr__(self) -> str:
+        return (
+            f"FileStats(lines={self.lines}, words={self.words}, "
+            f"bytes={self.bytes}, filename={self.filename!r})"
+        )
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, FileStats):
+            return NotImplemented
+        return (self.lines, self.words, self.bytes, self.filename) == (
+            other.lines,
+            other.words,
+            other.bytes,
+            other.filename,
+        )
+
+    def __str__(self) -> str:
+        """Format stats as wc output row"""
+        parts = [f"{self.lines:4d}", f"{self.words:4d}", f"{self.bytes:4d}"]
+        if self.filename:
+            parts.append(self.filename)
+        return " ".join(parts)
+
+
+class StatsCounter:
+    """
+    Incremental line/word/byte counter over binary chunks.
+    Words are counted with str.split() semantics: ASCII chunks are scanned as bytes,
+    other chunks are decoded incrementally. A word cut by a chunk boundary
+    is counted once.
+    """
+
+    def __init__(self, encoding: str = "utf-8", errors: str = "replace"):
+        self.lines = 0
+        self.words = 0
+        self.bytes = 0
+        self.in_word = False  # last seen character is part of a word
+        self.starts_in_word: Optional[bool] = None  # first character is not a space
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors)
+
+    def _count_words(self, chunk: str):
+        if not chunk:
+            return
+        self.words += len(chunk.split())
+        if self.starts_in_word is None:
+            self.starts_in_word = not chunk[:1].isspace()
+        if self.in_word and not chunk[:1].isspace():
+            self.words -= 1  # continuation of word from previous chunk
+        self.in_word = not chunk[-1:].isspace()
+
+    def _count_ascii_words(self, chunk: Union[bytes, bytearray]):
+        """Count word starts without splitting: each b" x" in translated chunk"""
+        if not chunk:
+            return
+        mask = chunk.translate(ASCII_WORDS_TABLE)
+        self.words += mask.count(b" x")
+        if self.starts_in_word is None:
+            self.starts_in_word = mask[:1] == b"x"
+        if not self.in_word and mask[:1] == b"x":
+            self.words += 1
+        self.in_word = mask[-1:] == b"x"
+
+    def update(self, chunk: Union[bytes, bytearray]):
+        self.lines += chunk.count(b"\n")
+        self.bytes += len(chunk)
+        if chunk.isascii() and not self._decoder.getstate()[0]:
+            self._count_ascii_words(chunk)
+        else:
+            self._count_words(self._decoder.decode(chunk))
+
+    def result(self) -> FileStats:
+        self._count_words(self._decoder.decode(b"", final=True))
+        return FileStats(lines=self.lines, words=self.words, bytes=self.bytes)
+
+
+class LastLinesBuffer:
+    """Keeps only chunks holding the last n lines (ring buffer over chunks)"""
+
+    def __init__(self, n: int = 10):
+        self.n = n
+        self._chunks: deque = deque()  # (chunk, number of newlines in it)
+        self._newlines = 0
+
+    def update(self, chunk: Union[bytes, bytearray]):
+        if self.n <= 0:
+            return
+        # Look for newlines from the end, at most n + 1 of them
+        newlines = 0
+        pos = len(chunk)
+        while newlines <= self.n:
+            pos = chunk.rfind(b"\n", 0, pos)
+            if pos < 0:
+                break
+            newlines += 1
+        if pos >= 0:
+            # Chunk alone holds the last n lines: drop everything before them
+            self._chunks.clear()
+            self._chunks.append((bytes(chunk[pos:]), newlines))
+            self._newlines = newlines
+            return
+
+        self._chunks.append((bytes(chunk), newlines))
+        self._newlines += newlines
+        # One extra newline guarantees the n-th line from the end is complete
+        while len(self._chunks) > 1 and self._newlines - self._chunks[0][1] > self.n:
+            _, dropped_newlines = self._chunks.popleft()
+            self._newlines -= dropped_newlines
+
+    def result(self) -> List[bytes]:
+        if self.n <= 0:
+            return []
+        data = b"".join(chunk for chunk, _ in self._chunks)
+        return io.BytesIO(data).readlines()[-self.n :]
+
+
+def line_selector(body_numbering: str):
+    """
+    Return predicate telling which lines get numbers (GNU nl -b STYLE):
+    a - all lines, t - nonempty lines, n - no lines, pBRE - lines matching BRE
+    """
+    if body_numbering == "a":
+        return None  # fast path, every line is numbered
+    if body_numbering == "t":
+        return lambda line: line != b""
+    if body_numbering == "n":
+        return lambda line: False
+    if body_numbering.startswith("p"):
+        import re  # rarely used, keep it off the startup path
+
+        try:
+            pattern = re.compile(body_numbering[1:].encode())
+        except re.error as e:
+            raise ValueError(f"invalid body numbering regex '{body_numbering}': {e}")
+        return lambda line: pattern.search(line) is not None
+    raise ValueError(f"invalid body numbering style: '{body_numbering}'")
+
+
+class NumberedLineWriter:
+    """
+    Writes numbered lines to binary output as chunks arrive.
+    Every chunk is formatted as one batch and written with one call.
+    """
+
+    def __init__(
+        self,
+        output: Optional[BinaryIO] = None,
+        body_numbering: str = "a",
+        starting_line_number: int = 1,
+        line_increment: int = 1,
+        number_width: int = 6,
+        number_separator: str = "\t",
+    ):
+        self.output = output or sys.stdout.buffer
+        separator = number_separator.encode()
+        width = str(number_width).encode()
+        # Separator is pasted into %-templates, its own % have to be escaped
+        escaped = separator.replace(b"%", b"%%")
+        self._number_fmt = b"%" + width + b"d" + escaped + b"%s\n"
+        self._no_number = b" " * (number_width + len(separator)) + b"%s\n"
+        self._is_numbered = line_selector(body_numbering)
+        self._numbers = count(starting_line_number, line_increment)
+        self._partial = b""  # last line of previous chunk without newline
+        self.n_lines = 0
+
+    def _write_lines(self, lines: List[bytes]):
+        """Format lines (without newlines) as one batch"""
+        if self._is_numbered is None:
+            # Single formatting call for the whole batch
+            batch = (self._number_fmt * len(lines)) % tuple(
+                chain.from_iterable(zip(islice(self._numbers, len(lines)), lines))
+            )
+        else:
+            batch = b"".join(
+                [
+                    (
+                        self._number_fmt % (next(self._numbers), line)
+                        if self._is_numbered(line)
+                        else self._no_number % line
+                    )
+                    for line in lines
+                ]
+            )
+        self.n_lines += len(lines)
+        self.output.write(batch)
+        self.output.flush()
+
+    def update(self, chunk: Union[bytes, bytearray]):
+        lines = (self._partial + chunk).split(b"\n")
+        self._partial = lines.pop()
+        if lines:
+            self._write_lines(lines)
+
+    def result(self) -> int:
+        """Flush last line without newline, return number of written lines"""
+        if self._partial:
+            self._write_lines([self._partial])
+            self._partial = b""
+        return self.n_lines
+
+
+def scan(
+    input_stream: BinaryIO,
+    consumers: List,
+    limit: Optional[int] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> List:
+    """
+    Read binary stream once (at most limit bytes) feeding chunks to consumers.
+
+    return: results of consumers in the same order
+    """
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    # readinto1 returns what is available, so interactive input isn't held back
+    readinto = getattr(input_stream, "readinto1", input_stream.readinto)
+    remaining = limit
+    while remaining is None or remaining > 0:
+        size = chunk_size if remaining is None else min(chunk_size, remaining)
+        n_read = readinto(view[:size])
+        if not n_read:
+            break
+        chunk = buffer if n_read == chunk_size else buffer[:n_read]
+        for consumer in consumers:
+            consumer.update(chunk)
+        if remaining is not None:
+            remaining -= n_read
+    view.release()
+    return [consumer.result() for consumer in consumers]
+
+
+class ScanResult(NamedTuple):
+    stats: Optional[FileStats]
+    last_lines: Optional[List[bytes]]
+    numbered_lines: Optional[int]
+
+
+def scan_file(
+    filename: Optional[str] = None,
+    stats: bool = True,
+    last_lines: Optional[int] = None,
+    numbered_output: Optional[BinaryIO] = None,
+    **numbering_options,
+) -> ScanResult:
+    """
+    Compute wc stats, last n lines and numbered output of file in one read.
+
+    Args:
+        filename: Path to input file. If None, reads from stdin
+        stats: Count lines, words and bytes
+        last_lines: Number of last lines to keep, None to skip
+        numbered_output: Binary stream to write numbered lines to, None to skip
+        **numbering_options: Options of NumberedLineWriter (body_numbering, ...)
+    """
+    consumers = {}
+    if stats:
+        consumers["stats"] = StatsCounter()
+    if last_lines is not None:
+        consumers["last_lines"] = LastLinesBuffer(last_lines)
+    if numbered_output is not None:
+        consumers["numbered_lines"] = NumberedLineWriter(
+            numbered_output, **numbering_options
+        )
+
+    if filename:
+        with open(filename, "rb") as f:
+            results = scan(f, list(consumers.values()))
+    else:
+        results = scan(sys.stdin.buffer, list(consumers.values()))
+
+    found = dict(zip(consumers, results))
+    if "stats" in found:
+        found["stats"].filename = filename
+    return ScanResult(
+        stats=found.get("stats"),
+        last_lines=found.get("last_lines"),
+        numbered_lines=found.get("numbered_lines"),
+    )
@@ -1,19 +1,72 @@
+import io
+import os
 import sys
-from typing import List, Optional, TextIO
+from collections import deque
+from typing import BinaryIO, List, Optional, TextIO
 
-import fire
+from src.cli import run_cli
+from src.scanner import LastLinesBuffer, scan
 
+BLOCK_SIZE = 64 * 1024
+OPTIONS = {"follow": bool, "follow_name": bool, "index": bool}
 
-def get_last_n_lines(input_stream: TextIO, n: int = 10) -> List[str]:
-    """Read last n lines from input stream"""
-    return input_stream.readlines()[-n:]
 
+def read_last_n_lines_seekable(input_stream: BinaryIO, n: int = 10) -> List[bytes]:
+    """
+    Read last n lines of seekable binary stream by reading blocks backwards from EOF.
+    Only the tail of the file containing the last n lines is kept in memory.
+    """
+    end = input_stream.seek(0, os.SEEK_END)
+    pos = end
+    blocks: List[bytes] = []
+    newlines = 0
+
+    # One extra newline guarantees the n-th line from the end is complete
+    while pos > 0 and newlines <= n:
+        size = min(BLOCK_SIZE, pos)
+        pos -= size
+        input_stream.seek(pos)
+        block = input_stream.read(size)
+        newlines += block.count(b"\n")
+        blocks.append(block)
+
+    input_stream.seek(end)
+    return io.BytesIO(b"".join(reversed(blocks))).readlines()[-n:]
 
-def print_file_header(filename: str, is_first: bool = True):
+
+def get_last_n_lines(input_stream: TextIO, n: int = 10) -> List[str]:
+    """Read last n lines from input stream"""
+    if n <= 0:
+        return []
+
+    # Regular files: read blocks from the end and decode only the last lines
+    buffer = getattr(input_stream, "buffer", None)
+    if buffer is not None and input_stream.seekable():
+        encoding = input_stream.encoding or "utf-8"
+        errors = input_stream.errors or "strict"
+        return [
+            line.decode(encoding, errors)
+            for line in read_last_n_lines_seekable(buffer, n)
+        ]
+
+    # Pipes and ttys: single pass keeping only chunks with the last n lines
+    if buffer is not None:
+        encoding = input_stream.encoding or "utf-8"
+        errors = input_stream.errors or "strict"
+        (last_lines,) = scan(buffer, [LastLinesBuffer(n)])
+        return [line.decode(encoding, errors) for line in last_lines]
+
+    # Text-only streams: keep only n lines in a ring buffer
+    return list(deque(input_stream, maxlen=n))
+
+
+def print_file_header(
+    filename: str, is_first: bool = True, file: Optional[TextIO] = None
+):
     """Print file header in tail format"""
     if not is_first:  # add space between outputs
-        print()
-    print(f"==> {filename} <==")
+        print(file=file)
+    print(f"==> {filename} <==", file=file)
 
 
 def process_single_source(
@@ -23,7 +76,7 @@ def process_single_source(
     n_lines: int = 10,
 ):
     """Process single input source (file or stdin) and print last n lines"""
-    if filename and len(sys.argv) > 2:  # No header for 1 file
+    if filename:  # header is shown only when several files are given
         print_file_header(filename, is_first)
 
     last_lines = get_last_n_lines(input_stream, n_lines)
@@ -31,26 +84,63 @@ def process_single_source(
         print(line.rstrip())
 
 
-def tail(*filenames: str):
+def process_indexed_file(
+    filename: str,
+    show_header: bool = False,
+    is_first: bool = True,
+    n_lines: int = 10,
+):
+    """Print last n lines of file using its persistent line index"""
+    from src.line_index import LineIndex
+
+    if show_header:
+        print_file_header(filename, is_first)
+
+    with LineIndex(filename) as index:
+        data = index.last_lines(n_lines)
+    for line in io.BytesIO(data):
+        print(line.decode(errors="replace").rstrip())
+
+
+def tail(
+    *filenames: str,
+    follow: bool = False,
+    follow_name: bool = False,
+    index: bool = False,
+):
     """
     Print the last 10 lines of each FILE to standard output.
 
     Args:
         *filenames: Variable number of input filenames
+        follow: Output appended data as the files grow (tail -f)
+        follow_name: Like follow, but reopen files that are truncated,
+            rotated or recreated under the same name (tail -F)
+        index: Use (and create or update) FILE.lineidx line offsets index
     """
     # Read from stdin if no files provided
     if not filenames:
         process_single_source(sys.stdin, n_lines=17)
         return
 
+    if follow or follow_name:
+        from src.follow import follow_files
+
+        follow_files(list(filenames), by_name=follow_name)
+        return
+
     # Process files
     for i, filename in enumerate(filenames):
+        if index:
+            process_indexed_file(filename, len(filenames) > 1, is_first=(i == 0))
+            continue
         with open(filename, "r") as f:
-            process_single_source(f, filename, is_first=(i == 0))
+            header_name = filename if len(filenames) > 1 else None
+            process_single_source(f, header_name, is_first=(i == 0))
 
 
 def tail_cli():
-    fire.Fire(tail)
+    run_cli(tail, OPTIONS)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,81 @@
+import hashlib
+import os
+
+from src import line_index
+from src.line_index import DIGEST_SPAN, LineIndex
+
+
+def write(path, data: bytes, mtime_ns: int):
+    with open(path, "r+b" if path.exists() else "wb") as f:
+        f.write(data)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_appended_lines_extend_index(tmp_path):
+    path = tmp_path / "log.txt"
+    write(path, b"a\nb\n", 10**18)
+    with LineIndex(str(path)) as index:
+        assert index.n_lines() == 2
+    with open(path, "ab") as f:
+        f.write(b"c\nd")
+    os.utime(path, ns=(2 * 10**18, 2 * 10**18))
+    with LineIndex(str(path)) as index:
+        assert index.n_lines() == 4
+        assert index.read_lines(2, 4) == b"c\nd"
+
+
+def test_same_size_rewrite_rebuilds_index(tmp_path):
+    path = tmp_path / "data.txt"
+    lines = b"".join(b"%04d\n" % i for i in range(2000))
+    write(path, lines, 10**18)
+    with LineIndex(str(path)) as index:
+        assert index.n_lines() == 2000
+
+    # Earlier bytes rewritten in place: same size, last 4 KiB untouched
+    head = b"\n" * 5 + lines[5:100]
+    write(path, head, 2 * 10**18)
+    assert path.stat().st_size == len(lines)
+    with LineIndex(str(path)) as index:
+        assert index.n_lines() == 2004
+        assert index.read_lines(0, 2) == b"\n\n"
+
+
+def test_rewrite_then_append_rebuilds_index(tmp_path):
+    path = tmp_path / "data.txt"
+    write(path, b"x" * 100 + b"\n", 10**18)
+    with LineIndex(str(path)) as index:
+        assert index.n_lines() == 1
+    write(path, b"x\n" * 50 + b"y\nz\n", 2 * 10**18)
+    with LineIndex(str(path)) as index:
+        assert index.n_lines() == 52
+        assert index.read_lines(50, 52) == b"y\nz\n"
+
+
+def test_extend_hashes_bounded_bytes(tmp_path, monkeypatch):
+    path = tmp_path / "big.log"
+    write(path, b"line\n" * (4 * DIGEST_SPAN), 10**18)
+    LineIndex(str(path)).close()
+
+    hashed = []
+    blake2b = hashlib.blake2b
+
+    class CountingDigest:
+        def __init__(self, **kwargs):
+            self._digest = blake2b(**kwargs)
+
+        def update(self, data):
+            hashed.append(len(data))
+            self._digest.update(data)
+
+        def digest(self):
+            return self._digest.digest()
+
+    monkeypatch.setattr(line_index.hashlib, "blake2b", CountingDigest)
+    with open(path, "ab") as f:
+        f.write(b"new\n")
+    os.utime(path, ns=(2 * 10**18, 2 * 10**18))
+    with LineIndex(str(path)) as index:
+        assert index.n_lines() == 4 * DIGEST_SPAN + 1
+        assert index.last_lines(1) == b"new\n"
+    # One check of the old edges, one digest of the new ones for the header
+    assert sum(hashed) <= 4 * DIGEST_SPAN
@@ -0,0 +1,41 @@
+import io
+
+import pytest
+
+from src.cli import run_cli
+from src.nl import OPTIONS, SHORT_FLAGS, nl, print_number_lines
+
+
+def number_lines(data: bytes, **options) -> bytes:
+    output = io.BytesIO()
+    print_number_lines(io.BytesIO(data), output=output, **options)
+    return output.getvalue()
+
+
+@pytest.mark.parametrize("body_numbering", ["a", "t"])
+@pytest.mark.parametrize("separator", ["%", "%d", "%s%%"])
+def test_separator_with_percent_is_literal(separator, body_numbering):
+    output = number_lines(
+        b"a\n\nb\n",
+        body_numbering=body_numbering,
+        number_width=2,
+        number_separator=separator,
+    )
+    sep = separator.encode()
+    if body_numbering == "a":
+        assert output == b" 1" + sep + b"a\n 2" + sep + b"\n 3" + sep + b"b\n"
+    else:
+        blank = b" " * (2 + len(sep)) + b"\n"
+        assert output == b" 1" + sep + b"a\n" + blank + b" 2" + sep + b"b\n"
+
+
+@pytest.mark.parametrize("style", ["x", "p["])
+def test_invalid_body_numbering_is_usage_error(tmp_path, capsys, style):
+    path = tmp_path / "in.txt"
+    path.write_bytes(b"a\n")
+    with pytest.raises(SystemExit) as exit_info:
+        run_cli(nl, OPTIONS, SHORT_FLAGS, args=["-b", style, str(path)])
+    assert exit_info.value.code == 2
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert captured.err.startswith("ERROR: invalid value for --body_numbering")
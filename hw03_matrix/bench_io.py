@@ -0,0 +1,59 @@
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from matrix import Matrix
+from matrix_numpy_mixin import MatrixNumpy
+
+
+def measure(name: str, func, fpath: Path):
+    start_time = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start_time
+    print(f"{name:<36} {elapsed:8.3f}s {fpath.stat().st_size / 1024**2:10.1f} MB")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Matrix save/load benchmark")
+    parser.add_argument("-n", type=int, default=2000, help="Matrix size n x n")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    array = rng.random((args.n, args.n))
+    matrix = Matrix(array.tolist())
+    matrix_numpy = MatrixNumpy(array)
+
+    print(f"{args.n}x{args.n} float64:")
+    print(f"{'operation':<36} {'time':>9} {'file size':>13}")
+    print("-" * 60)
+    with tempfile.TemporaryDirectory() as tmp:
+        text, binary = Path(tmp) / "matrix.txt", Path(tmp) / "matrix.bin"
+        measure("Matrix.save_to_file (text)", lambda: matrix.save_to_file(text), text)
+        measure("Matrix.save_binary", lambda: matrix.save_binary(binary), binary)
+        measure(
+            "MatrixNumpy.save_binary",
+            lambda: matrix_numpy.save_binary(binary),
+            binary,
+        )
+        loaded = measure("Matrix.load (text)", lambda: Matrix.load(text), text)
+        assert loaded == matrix
+        loaded = measure("Matrix.load (binary)", lambda: Matrix.load(binary), binary)
+        assert loaded == matrix
+        measure(
+            "Matrix.load (binary, verify)",
+            lambda: Matrix.load(binary, verify=True),
+            binary,
+        )
+        loaded = measure(
+            "MatrixNumpy.load (binary, mmap)", lambda: MatrixNumpy.load(binary), binary
+        )
+        assert np.array_equal(loaded.data, array)
+        del loaded
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import argparse
+import random
+import time
+import tracemalloc
+
+from matrix import Matrix
+
+
+def measure(name: str, func) -> Matrix:
+    """Time func, then run it again under tracemalloc for peak memory"""
+    Matrix.clear_cache()
+    start_time = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start_time
+    Matrix.clear_cache()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<32} {elapsed:8.3f}s {peak / 1024**2:10.1f} MB")
+    return result
+
+
+def random_matrix(rows: int, cols: int) -> Matrix:
+    return Matrix([[random.random() for _ in range(cols)] for _ in range(rows)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lazy Matrix expressions benchmark")
+    parser.add_argument("-n", type=int, default=1000, help="Matrix size n x n")
+    args = parser.parse_args()
+    n = args.n
+
+    random.seed(0)
+    a, b, c, d = (random_matrix(n, n) for _ in range(4))
+    print(f"Element-wise pipeline, {n}x{n}:")
+    print(f"{'':<32} {'time':>9} {'peak alloc':>13}")
+    eager = measure("eager", lambda: (a + b) * c - d * (a + b) + a * c)
+    lazy = measure(
+        "lazy (fused, shared a + b)",
+        lambda: ((a.lazy() + b) * c - d * (a.lazy() + b) + a.lazy() * c).evaluate(),
+    )
+    assert eager == lazy
+
+    # Left to right costs n*k*n + n*n*k, right to left n*k*k + ... much less
+    k = max(1, n // 50)
+    x, y, z = random_matrix(n, k), random_matrix(k, n), random_matrix(n, k)
+    print(f"\nChain ({n}x{k}) @ ({k}x{n}) @ ({n}x{k}):")
+    eager = measure("eager, left to right", lambda: x @ y @ z)
+    lazy = measure("lazy, reordered", lambda: (x.lazy() @ y @ z).evaluate())
+    assert all(
+        abs(p - q) <= 1e-9 * max(1.0, abs(p))
+        for p, q in zip(eager.storage, lazy.storage)
+    )
+
+
+if __name__ == "__main__":
+    main()
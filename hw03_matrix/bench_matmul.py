@@ -0,0 +1,58 @@
+import argparse
+import time
+
+import numpy as np
+
+from matrix import Matrix
+from matrix_numpy_mixin import MatrixNumpy
+
+
+def matmul_naive(a, b):
+    """Previous implementation: triple loop with column-strided access"""
+    return [
+        [sum(a[i][k] * b[k][j] for k in range(len(b))) for j in range(len(b[0]))]
+        for i in range(len(a))
+    ]
+
+
+def timed(func) -> float:
+    start_time = time.perf_counter()
+    func()
+    return time.perf_counter() - start_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Matrix multiplication benchmark")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[64, 128, 256, 512, 1024]
+    )
+    parser.add_argument(
+        "--naive-max", type=int, default=256, help="Skip naive version above size"
+    )
+    args = parser.parse_args()
+
+    np.random.seed(0)
+    print(f"{'n':>6} {'naive':>10} {'blocked':>10} {'strassen':>10} {'numpy':>10}")
+    print("-" * 50)
+    for n in args.sizes:
+        a_list = np.random.random((n, n)).tolist()
+        b_list = np.random.random((n, n)).tolist()
+        a, b = Matrix(a_list), Matrix(b_list)
+
+        naive_time = (
+            timed(lambda: matmul_naive(a_list, b_list))
+            if n <= args.naive_max
+            else float("nan")
+        )
+        blocked_time = timed(lambda: Matrix._matmul_blocked(a, b))
+        strassen_time = timed(lambda: Matrix._matmul_strassen(a, b))
+        a_np, b_np = MatrixNumpy(a_list), MatrixNumpy(b_list)
+        numpy_time = timed(lambda: a_np @ b_np)
+        print(
+            f"{n:>6} {naive_time:>10.3f} {blocked_time:>10.3f} "
+            f"{strassen_time:>10.3f} {numpy_time:>10.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+import argparse
+import random
+import tracemalloc
+
+from matrix import Matrix
+
+
+def traced_size(build) -> int:
+    """Memory held by object created by build(), in bytes"""
+    tracemalloc.start()
+    obj = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Matrix storage memory benchmark")
+    parser.add_argument("-n", type=int, default=2000, help="Matrix size n x n")
+    args = parser.parse_args()
+    n = args.n
+
+    random.seed(0)
+    values = [[random.random() for _ in range(n)] for _ in range(n)]
+
+    list_size = traced_size(lambda: [[x * 1.0 for x in row] for row in values])
+    matrix_size = traced_size(lambda: Matrix(values))
+
+    print(f"Matrix {n}x{n} of floats:")
+    print("-" * 60)
+    print(f"List[List[float]]: {list_size / 1024**2:8.1f} MB")
+    print(f"Matrix (array):    {matrix_size / 1024**2:8.1f} MB")
+    print(f"Reduction:         {list_size / matrix_size:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
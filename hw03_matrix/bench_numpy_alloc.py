@@ -0,0 +1,70 @@
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from matrix_numpy_mixin import MatrixNumpy
+
+
+def measure(name: str, func, matrix_bytes: int, repeats: int = 10):
+    """
+    Time func and count matrix-sized buffers it allocates.
+    numpy reports array data to tracemalloc, so the traced peak over the call
+    divided by the matrix size is the number of full buffers alive at once.
+    """
+    func()  # warm up
+    start_time = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    elapsed = (time.perf_counter() - start_time) / repeats
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<36} {elapsed * 1000:8.2f} ms {peak / matrix_bytes:8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MatrixNumpy allocation benchmark")
+    parser.add_argument("-n", type=int, default=2000, help="Matrix size n x n")
+    args = parser.parse_args()
+    n = args.n
+
+    rng = np.random.default_rng(0)
+    array = rng.random((n, n))
+    a = MatrixNumpy(array)
+    b = MatrixNumpy(rng.random((n, n)))
+    out = MatrixNumpy(np.empty((n, n)))
+    a32 = MatrixNumpy(array, dtype=np.float32)
+    b32 = MatrixNumpy(b, dtype=np.float32)
+
+    print(f"MatrixNumpy {n}x{n} float64:")
+    print(f"{'operation':<36} {'time':>11} {'buffers':>8}")
+    print("-" * 57)
+    nbytes = array.nbytes
+    measure("wrap ndarray, copy=True", lambda: MatrixNumpy(array, copy=True), nbytes)
+    measure("wrap ndarray (zero-copy)", lambda: MatrixNumpy(array), nbytes)
+    measure("a + b", lambda: a + b, nbytes)
+    measure("np.add(a, b, out=out)", lambda: np.add(a, b, out=out), nbytes)
+
+    def iadd():
+        nonlocal out
+        out += b
+
+    measure("out += b", iadd, nbytes)
+    measure("(a + b) * a", lambda: (a + b) * a, nbytes)
+
+    def fused():
+        np.add(a, b, out=out)
+        np.multiply(out, a, out=out)
+
+    measure("(a + b) * a with out=", fused, nbytes)
+    measure("np.sum(a)", lambda: np.sum(a), nbytes)
+    measure("np.mean(a, axis=0)", lambda: np.mean(a, axis=0), nbytes)
+    measure("a32 + b32 (float32)", lambda: a32 + b32, nbytes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import argparse
+import random
+import time
+import tracemalloc
+
+from matrix import Matrix
+from sparse_matrix import SparseMatrix
+
+
+def random_sparse(n: int, density: float) -> SparseMatrix:
+    nnz = int(n * n * density)
+    positions = random.sample(range(n * n), nnz)
+    return SparseMatrix.from_coo(
+        [p // n for p in positions],
+        [p % n for p in positions],
+        [random.random() for _ in range(nnz)],
+        n,
+        n,
+    )
+
+
+def measure(name: str, func):
+    """Time func, then run it again under tracemalloc, which slows it down"""
+    start_time = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start_time
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<24} {elapsed:8.3f}s {peak / 1024**2:10.1f} MB")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SparseMatrix benchmark")
+    parser.add_argument("-n", type=int, default=10000, help="Matrix size n x n")
+    parser.add_argument("--density", type=float, default=0.001)
+    parser.add_argument("--dense-cols", type=int, default=16)
+    args = parser.parse_args()
+    n = args.n
+
+    random.seed(0)
+    a = measure("build (COO -> CSR)", lambda: random_sparse(n, args.density))
+    b = random_sparse(n, args.density)
+    dense = Matrix(
+        [[random.random() for _ in range(args.dense_cols)] for _ in range(n)]
+    )
+
+    print(f"\n{n}x{n}, density {args.density}, nnz {a.nnz}")
+    print(f"{'operation':<24} {'time':>9} {'peak alloc':>13}")
+    print("-" * 48)
+    measure("sparse + sparse", lambda: a + b)
+    measure("sparse * sparse", lambda: a * b)
+    product = measure("sparse @ sparse", lambda: a @ b)
+    measure(f"sparse @ dense {n}x{args.dense_cols}", lambda: a @ dense)
+    measure("transpose", a.transpose)
+    measure("hash", lambda: hash(a))
+    print(f"\nnnz of sparse @ sparse: {product.nnz}")
+
+    csr_bytes = sum(x.itemsize * len(x) for x in (a.values, a.indices, a.indptr))
+    print(f"CSR storage:           {csr_bytes / 1024**2:10.1f} MB")
+    print(f"Dense Matrix storage:  {8 * n * n / 1024**2:10.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""
+Benchmark suite for matrix backends with regression tracking.
+
+Every (backend, operation, size) case runs in a fresh worker process, so its
+peak RSS is not inflated by earlier cases. Reported per case:
+- wall time: min and median over repeats (perf_counter)
+- peak of traced allocations during one extra run (tracemalloc)
+- peak RSS of the worker process and its RSS before the operation
+
+python bench_suite.py --output results.json
+python bench_suite.py --baseline results.json --threshold 0.25
+"""
+
+import argparse
+import json
+import multiprocessing
+import platform
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from matrix import Matrix
+from matrix_numpy_mixin import MatrixNumpy
+from sparse_matrix import SparseMatrix
+
+SIZES = [8, 32, 128, 512, 2048]
+# Pure Python products are cubic, skip them above this size by default
+MAX_PYTHON_MATMUL = 512
+MIN_TIME = 0.2  # seconds of repeats per case
+MAX_REPEATS = 20
+
+BACKENDS: Dict[str, Callable[[List[List[int]]], object]] = {
+    "Matrix": Matrix,
+    "MatrixNumpy": MatrixNumpy,
+    "SparseMatrix": SparseMatrix,
+}
+
+
+def _save(matrix, binary: bool):
+    with tempfile.TemporaryDirectory() as tmp:
+        if binary:
+            matrix.save_binary(Path(tmp) / "matrix.bin")
+        else:
+            matrix.save_to_file(Path(tmp) / "matrix.txt")
+
+
+def _matmul_uncached(a, b):
+    Matrix.clear_cache()
+    return a @ b
+
+
+# operation -> (function of operands a, b, backends it applies to)
+OPERATIONS: Dict[str, Tuple[Callable, Tuple[str, ...]]] = {
+    "add": (lambda a, b: a + b, tuple(BACKENDS)),
+    "mul": (lambda a, b: a * b, tuple(BACKENDS)),
+    "matmul": (_matmul_uncached, tuple(BACKENDS)),
+    "matmul_cached": (lambda a, b: a @ b, ("Matrix",)),
+    "hash": (lambda a, b: hash(a), ("Matrix", "SparseMatrix")),
+    "content_digest": (lambda a, b: a.content_digest(), ("Matrix", "SparseMatrix")),
+    "eq": (lambda a, b: a == b, tuple(BACKENDS)),
+    "str": (lambda a, b: str(a), tuple(BACKENDS)),
+    "save_text": (lambda a, b: _save(a, binary=False), tuple(BACKENDS)),
+    "save_binary": (lambda a, b: _save(a, binary=True), ("Matrix", "MatrixNumpy")),
+}
+
+
+def random_data(size: int, density: float, seed: int) -> List[List[int]]:
+    rng = random.Random(seed)
+    return [
+        [rng.randint(1, 9) if rng.random() < density else 0 for _ in range(size)]
+        for _ in range(size)
+    ]
+
+
+def peak_rss() -> int:
+    """Peak resident set size of this process, bytes"""
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def run_case(backend: str, operation: str, size: int, density: float) -> Dict:
+    """Measure one case, runs in a worker process"""
+    func = OPERATIONS[operation][0]
+    a = BACKENDS[backend](random_data(size, density, seed=0))
+    # b equals a for eq, so the comparison has to look at every element
+    b = a if operation == "eq" else BACKENDS[backend](random_data(size, density, 1))
+    rss_before = peak_rss()
+
+    func(a, b)  # warm up, also fills the cache for matmul_cached
+    times = []
+    start_time = time.perf_counter()
+    while len(times) < MAX_REPEATS and (
+        not times or time.perf_counter() - start_time < MIN_TIME
+    ):
+        case_start = time.perf_counter()
+        func(a, b)
+        times.append(time.perf_counter() - case_start)
+
+    tracemalloc.start()
+    func(a, b)
+    _, alloc_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "backend": backend,
+        "operation": operation,
+        "size": size,
+        "repeats": len(times),
+        "time_min": min(times),
+        "time_median": statistics.median(times),
+        "alloc_peak_bytes": alloc_peak,
+        "rss_before_bytes": rss_before,
+        "peak_rss_bytes": peak_rss(),
+    }
+
+
+def case_key(result: Dict) -> Tuple[str, str, int]:
+    return result["backend"], result["operation"], result["size"]
+
+
+def compare(
+    results: List[Dict], baseline: List[Dict], threshold: float, min_time: float
+) -> List[Dict]:
+    """
+    Cases whose min time grew by more than threshold (0.25 = 25%).
+    Cases faster than min_time in baseline are too noisy and skipped.
+    """
+    baseline_by_key = {case_key(x): x for x in baseline}
+    regressions = []
+    for result in results:
+        base = baseline_by_key.get(case_key(result))
+        if base is None or base["time_min"] < min_time:
+            continue
+        ratio = result["time_min"] / base["time_min"]
+        result["baseline_time_min"] = base["time_min"]
+        result["ratio"] = ratio
+        if ratio > 1 + threshold:
+            regressions.append(result)
+    return regressions
+
+
+def print_results(results: List[Dict]):
+    print(
+        f"{'backend':<13} {'operation':<15} {'size':>5} {'time min':>11} "
+        f"{'alloc peak':>11} {'peak RSS':>10} {'vs base':>8}"
+    )
+    print("-" * 79)
+    for x in results:
+        ratio = f"{x['ratio']:7.2f}x" if "ratio" in x else ""
+        print(
+            f"{x['backend']:<13} {x['operation']:<15} {x['size']:>5} "
+            f"{x['time_min'] * 1000:9.3f}ms "
+            f"{x['alloc_peak_bytes'] / 1024**2:9.2f}MB "
+            f"{x['peak_rss_bytes'] / 1024**2:8.1f}MB {ratio:>8}"
+        )
+
+
+def run_suite(
+    backends: List[str], operations: List[str], sizes: List[int], args
+) -> List[Dict]:
+    cases = [
+        (backend, operation, size)
+        for backend in backends
+        for operation in operations
+        for size in sizes
+        if backend in OPERATIONS[operation][1]
+        and not (
+            operation.startswith("matmul")
+            and backend != "MatrixNumpy"
+            and size > args.max_python_matmul
+        )
+    ]
+    # One process per case: clean RSS and allocator state
+    context = multiprocessing.get_context("fork" if sys.platform != "win32" else None)
+    results = []
+    with context.Pool(processes=1, maxtasksperchild=1) as pool:
+        for backend, operation, size in cases:
+            x = pool.apply(run_case, (backend, operation, size, args.density))
+            results.append(x)
+            print(
+                f"  {backend} {operation} {size}: {x['time_min'] * 1000:.3f}ms",
+                file=sys.stderr,
+            )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Matrix backends benchmark suite")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument(
+        "--backends", nargs="+", default=list(BACKENDS), choices=list(BACKENDS)
+    )
+    parser.add_argument(
+        "--operations", nargs="+", default=list(OPERATIONS), choices=list(OPERATIONS)
+    )
+    parser.add_argument(
+        "--density", type=float, default=0.1, help="Share of nonzero elements"
+    )
+    parser.add_argument(
+        "--max-python-matmul",
+        type=int,
+        default=MAX_PYTHON_MATMUL,
+        help="Largest size of Matrix/SparseMatrix matmul cases",
+    )
+    parser.add_argument("--output", type=Path, help="Write results JSON here")
+    parser.add_argument("--baseline", type=Path, help="Results JSON to compare with")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Fail if min time grows by more than this share of baseline",
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=1e-3,
+        help="Don't compare cases faster than this in baseline, seconds",
+    )
+    args = parser.parse_args()
+
+    results = run_suite(args.backends, args.operations, args.sizes, args)
+    regressions: Optional[List[Dict]] = None
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())["results"]
+        regressions = compare(results, baseline, args.threshold, args.min_time)
+    print_results(results)
+
+    if args.output:
+        report = {
+            "meta": {
+                "date": datetime.now(timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "numpy": np.__version__,
+                "platform": platform.platform(),
+                "density": args.density,
+            },
+            "results": results,
+        }
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f"\nSaved to {args.output}")
+
+    if regressions:
+        print(f"\n{len(regressions)} regressions over {args.threshold:.0%}:")
+        for x in regressions:
+            print(
+                f"  {x['backend']} {x['operation']} {x['size']}: "
+                f"{x['baseline_time_min'] * 1000:.3f}ms -> "
+                f"{x['time_min'] * 1000:.3f}ms ({x['ratio']:.2f}x)"
+            )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+from array import array
+from collections import defaultdict
+from typing import Callable, Dict, List, Set, Tuple, Union
+
+from matrix import Matrix, make_storage
+from mixins import SaveMixin, ToStringMixin
+
+ELEMENT_WISE_OPS = ("+", "-", "*")
+
+# Compiled fused kernels by source, expressions of the same shape share one
+_kernels: Dict[str, Callable] = {}
+
+
+class LazyMatrix(
+    SaveMixin,
+    ToStringMixin,
+):
+    """
+    Node of deferred Matrix expression. Operators only build the graph,
+    it is evaluated on .data, str(), save_to_file() or evaluate():
+    - chains of element-wise operations run as one fused pass over storages
+    - equal subexpressions are computed once
+    - chains of @ are multiplied in the cheapest order (matrix-chain DP)
+    """
+
+    __slots__ = ("op", "operands", "rows", "cols", "_result")
+    # Equal by value like Matrix, but nodes are not hashable
+    __hash__ = None
+
+    def __init__(self, matrix: Matrix):
+        self.op = "leaf"
+        self.operands: Tuple = (matrix,)
+        self.rows = matrix.rows
+        self.cols = matrix.cols
+        self._result = matrix
+
+    @classmethod
+    def _node(cls, op: str, left: "LazyMatrix", right: "LazyMatrix") -> "LazyMatrix":
+        node = cls.__new__(cls)
+        node.op = op
+        node.operands = (left, right)
+        node.rows = left.rows
+        node.cols = right.cols
+        node._result = None
+        return node
+
+    @staticmethod
+    def _wrap(other: Union["LazyMatrix", Matrix]) -> "LazyMatrix":
+        if isinstance(other, LazyMatrix):
+            return other
+        if isinstance(other, Matrix):
+            return LazyMatrix(other)
+        raise ValueError("Can only operate with Matrix objects")
+
+    def _element_wise(self, other, op: str) -> "LazyMatrix":
+        other = self._wrap(other)
+        if (self.rows, self.cols) != (other.rows, other.cols):
+            raise ValueError(
+                "Matrices must have same dimensions for element-wise operations"
+            )
+        return LazyMatrix._node(op, self, other)
+
+    def __add__(self, other) -> "LazyMatrix":
+        return self._element_wise(other, "+")
+
+    def __sub__(self, other) -> "LazyMatrix":
+        return self._element_wise(other, "-")
+
+    def __mul__(self, other) -> "LazyMatrix":
+        return self._element_wise(other, "*")
+
+    def __matmul__(self, other) -> "LazyMatrix":
+        other = self._wrap(other)
+        if self.cols != other.rows:
+            raise ValueError("Invalid dimensions for matrix multiplication")
+        return LazyMatrix._node("@", self, other)
+
+    def __radd__(self, other) -> "LazyMatrix":
+        return self._wrap(other)._element_wise(self, "+")
+
+    def __rsub__(self, other) -> "LazyMatrix":
+        return self._wrap(other)._element_wise(self, "-")
+
+    def __rmul__(self, other) -> "LazyMatrix":
+        return self._wrap(other)._element_wise(self, "*")
+
+    def __rmatmul__(self, other) -> "LazyMatrix":
+        return self._wrap(other) @ self
+
+    def evaluate(self) -> Matrix:
+        if self._result is None:
+            self._result = _Evaluator().evaluate(self)
+        return self._result
+
+    @property
+    def data(self) -> List[memoryview]:
+        return self.evaluate().data
+
+    def tolist(self) -> List[List[float]]:
+        return self.evaluate().tolist()
+
+    def __buffer__(self, flags: int) -> memoryview:
+        return memoryview(self.evaluate())
+
+    def __eq__(self, other) -> bool:
+        """Evaluate and compare elements with Matrix or LazyMatrix"""
+        if not isinstance(other, (LazyMatrix, Matrix)):
+            return NotImplemented
+        if (self.rows, self.cols) != (other.rows, other.cols):
+            return False  # no need to evaluate
+        if isinstance(other, LazyMatrix):
+            other = other.evaluate()
+        return self.evaluate() == other
+
+
+class _Evaluator:
+    """
+    Evaluates expression graph. Nodes are numbered by structure, so equal
+    subexpressions built separately get the same id and one result.
+    """
+
+    def __init__(self):
+        self.ids: Dict[int, int] = {}  # id(node) -> structural id
+        self.structures: Dict[tuple, int] = {}
+        self.nodes: Dict[int, LazyMatrix] = {}  # structural id -> node
+        self.parents: Dict[int, Set[int]] = defaultdict(set)
+        self.results: Dict[int, Matrix] = {}
+
+    def number(self, root: LazyMatrix) -> int:
+        """Assign structural ids bottom-up and collect parents of every node"""
+        stack = [(root, False)]
+        while stack:
+            node, children_done = stack.pop()
+            if id(node) in self.ids:
+                continue
+            if node.op == "leaf":
+                structure: tuple = ("leaf", id(node.operands[0]))
+            elif children_done:
+                structure = (node.op,) + tuple(self.ids[id(x)] for x in node.operands)
+            else:
+                stack.append((node, True))
+                stack.extend((x, False) for x in node.operands)
+                continue
+            node_id = self.structures.setdefault(structure, len(self.structures))
+            self.ids[id(node)] = node_id
+            if node_id not in self.nodes:
+                self.nodes[node_id] = node
+                for child_id in structure[1:] if node.op != "leaf" else ():
+                    self.parents[child_id].add(node_id)
+        return self.ids[id(root)]
+
+    def is_inlined(self, node_id: int, op_group: Tuple[str, ...]) -> bool:
+        """Node is computed inside its parent if it's of the same kind and unshared"""
+        node = self.nodes[node_id]
+        return (
+            node.op in op_group
+            and node._result is None
+            and len(self.parents[node_id]) == 1
+        )
+
+    def evaluate(self, root: LazyMatrix) -> Matrix:
+        root_id = self.number(root)
+        # Iterative post-order over fusion groups: inputs before consumers
+        stack = [(root_id, False)]
+        while stack:
+            node_id, inputs_done = stack.pop()
+            if node_id in self.results:
+                continue
+            node = self.nodes[node_id]
+            if node._result is not None:
+                self.results[node_id] = node._result
+                continue
+            if node.op in ELEMENT_WISE_OPS:
+                inputs = self.fused_inputs(node_id)
+            else:
+                inputs = self.chain_operands(node_id)
+            if not inputs_done:
+                stack.append((node_id, True))
+                stack.extend((x, False) for x in inputs)
+                continue
+            if node.op in ELEMENT_WISE_OPS:
+                self.results[node_id] = self.run_fused(node_id, inputs)
+            else:
+                self.results[node_id] = self.run_chain(inputs)
+        return self.results[root_id]
+
+    def children(self, node_id: int) -> Tuple[int, ...]:
+        return tuple(self.ids[id(x)] for x in self.nodes[node_id].operands)
+
+    def fused_inputs(self, node_id: int) -> List[int]:
+        """Materialized inputs of element-wise group rooted at node_id, in order"""
+        inputs: List[int] = []
+        stack = [node_id]
+        seen = set()
+        while stack:
+            current = stack.pop()
+            for child_id in reversed(self.children(current)):
+                if child_id in seen:
+                    continue
+                seen.add(child_id)
+                if self.is_inlined(child_id, ELEMENT_WISE_OPS):
+                    stack.append(child_id)
+                else:
+                    inputs.append(child_id)
+        return inputs
+
+    def run_fused(self, node_id: int, inputs: List[int]) -> Matrix:
+        """Generate one kernel for the whole group and map it over storages"""
+        names = {input_id: f"a{i}" for i, input_id in enumerate(inputs)}
+        lines = []
+        stack = [(node_id, False)]
+        while stack:
+            current, children_done = stack.pop()
+            if current in names:
+                continue
+            if not children_done:
+                stack.append((current, True))
+                stack.extend((x, False) for x in reversed(self.children(current)))
+                continue
+            left, right = (names[x] for x in self.children(current))
+            names[current] = f"t{len(lines)}"
+            op = self.nodes[current].op
+            lines.append(f"    {names[current]} = {left} {op} {right}")
+
+        source = "def kernel({}):\n{}\n    return {}".format(
+            ", ".join(names[x] for x in inputs), "\n".join(lines), names[node_id]
+        )
+        if source not in _kernels:
+            namespace: dict = {}
+            exec(compile(source, "<fused kernel>", "exec"), namespace)
+            _kernels[source] = namespace["kernel"]
+
+        storages = [self.results[x].storage for x in inputs]
+        node = self.nodes[node_id]
+        # +, -, * keep ints ints: fill the result array straight from the map,
+        # without a list of Python numbers in between
+        is_int = all(self.results[x].typecode == "q" for x in inputs)
+        try:
+            result = array("q" if is_int else "d", map(_kernels[source], *storages))
+        except OverflowError:
+            result = make_storage(list(map(_kernels[source], *storages)))
+        return Matrix.from_storage(result, node.rows, node.cols)
+
+    def chain_operands(self, node_id: int) -> List[int]:
+        """Operands of matmul chain A @ B @ ... rooted at node_id, left to right"""
+        operands: List[int] = []
+        stack = [node_id]
+        while stack:
+            current = stack.pop()
+            if current != node_id and not self.is_inlined(current, ("@",)):
+                operands.append(current)
+            else:
+                stack.extend(reversed(self.children(current)))
+        return operands
+
+    def run_chain(self, operands: List[int]) -> Matrix:
+        """Multiply in the order with fewest scalar multiplications"""
+        matrices = [self.results[x] for x in operands]
+        n = len(matrices)
+        dims = [m.rows for m in matrices] + [matrices[-1].cols]
+        cost = [[0] * n for _ in range(n)]
+        split = [[0] * n for _ in range(n)]
+        for length in range(2, n + 1):
+            for i in range(n - length + 1):
+                j = i + length - 1
+                best = None
+                for k in range(i, j):
+                    step = dims[i] * dims[k + 1] * dims[j + 1]
+                    candidate = (cost[i][k] + cost[k + 1][j] + step, k)
+                    if best is None or candidate < best:
+                        best = candidate
+                cost[i][j], split[i][j] = best
+
+        def multiply(i: int, j: int) -> Matrix:
+            if i == j:
+                return matrices[i]
+            k = split[i][j]
+            return multiply(i, k) @ multiply(k + 1, j)
+
+        return multiply(0, n - 1)
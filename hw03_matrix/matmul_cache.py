@@ -0,0 +1,108 @@
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional, Tuple
+
+if TYPE_CHECKING:
+    from matrix import Matrix
+
+CacheKey = Tuple[bytes, bytes]
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    collisions: int = 0  # equal digests but different operands
+    entries: int = 0
+    bytes: int = 0
+
+
+@dataclass
+class CacheEntry:
+    # Views of operand storages, compared on hit. If an operand is changed in
+    # place later, its view no longer matches and lookups of the old operand
+    # miss (counted as collisions)
+    left: Optional[memoryview]
+    right: Optional[memoryview]
+    result: "Matrix"  # private copy, never handed out
+    size: int
+
+
+def _same(stored: memoryview, matrix: "Matrix") -> bool:
+    view = memoryview(matrix.storage)
+    if stored == view:
+        return True
+    # NaN != NaN elementwise, equal bytes still mean equal operands
+    return stored.format == "d" and stored.tobytes() == view.tobytes()
+
+
+def _copy(matrix: "Matrix") -> "Matrix":
+    storage = array(matrix.typecode, matrix.storage)
+    return type(matrix).from_storage(storage, matrix.rows, matrix.cols)
+
+
+class MatmulCache:
+    """
+    LRU cache of matrix products with a byte budget.
+    Keyed by content digests of operands (see Matrix.content_digest), a hit is
+    confirmed by comparing the stored operand views, so collisions can't return
+    a wrong product. Products are copied in and out, so writes to a returned
+    matrix don't change the cached one.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, verify: bool = True):
+        self.max_bytes = max_bytes
+        self.verify = verify
+        self._entries: "OrderedDict[CacheKey, CacheEntry]" = OrderedDict()
+        self._stats = CacheStats()
+
+    @staticmethod
+    def key(left: "Matrix", right: "Matrix") -> CacheKey:
+        return left.content_digest(), right.content_digest()
+
+    def get(self, left: "Matrix", right: "Matrix") -> Optional["Matrix"]:
+        key = self.key(left, right)
+        entry = self._entries.get(key)
+        if entry is None:
+            self._stats.misses += 1
+            return None
+        if self.verify and not (_same(entry.left, left) and _same(entry.right, right)):
+            self._stats.collisions += 1
+            self._stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._stats.hits += 1
+        return _copy(entry.result)
+
+    def put(self, left: "Matrix", right: "Matrix", result: "Matrix"):
+        key = self.key(left, right)
+        operands = (
+            (memoryview(left.storage), memoryview(right.storage))
+            if self.verify
+            else (None, None)
+        )
+        size = sum(view.nbytes for view in operands if view is not None)
+        size += result.storage.itemsize * len(result.storage)
+        if size > self.max_bytes:
+            return  # would evict everything and still not fit
+
+        if key in self._entries:
+            self._stats.bytes -= self._entries.pop(key).size
+        self._entries[key] = CacheEntry(*operands, result=_copy(result), size=size)
+        self._stats.bytes += size
+        while self._stats.bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._stats.bytes -= evicted.size
+            self._stats.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self._stats.bytes = 0
+
+    def stats(self) -> CacheStats:
+        return CacheStats(**{**vars(self._stats), "entries": len(self._entries)})
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,22 +1,216 @@
+import hashlib
+import math
 import operator
+import sys
+from array import array
+from itertools import chain
 from pathlib import Path
-from typing import Callable, Dict, List, Tuple
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple, Union
 
+import matrix_io
+from matmul_cache import MatmulCache
 from mixins import MatrixHashMixin, SaveMixin, ToStringMixin
 
+CACHE_BYTES = 256 * 1024  # working set of one tile of B columns
+
+
+def _sumprod(p: Iterable[float], q: Iterable[float]) -> float:
+    return sum(map(operator.mul, p, q))
+
+
+sumprod = getattr(math, "sumprod", _sumprod)  # math.sumprod is new in 3.12
+
+
+# (module, class) of operands that handle Matrix in their reflected operators
+DEFERRED_TYPES = (("lazy_matrix", "LazyMatrix"), ("sparse_matrix", "SparseMatrix"))
+
+
+def _defers(value) -> bool:
+    """
+    LazyMatrix or SparseMatrix operand: return NotImplemented, so its
+    reflected operator extends the expression or keeps the sparsity
+    """
+    for module_name, class_name in DEFERRED_TYPES:
+        module = sys.modules.get(module_name)
+        if module is not None and isinstance(value, getattr(module, class_name)):
+            return True
+    return False
+
+
+INT64_OVERFLOW = (
+    "Integer elements must fit in int64, convert the matrix to float "
+    "for larger values"
+)
+
+
+def make_storage(values: Iterable[float]) -> array:
+    """
+    Pack values into array('q') if they are all ints, array('d') otherwise.
+    Ints beyond int64 raise OverflowError instead of silently becoming floats.
+    """
+    values = values if isinstance(values, (list, tuple, array)) else list(values)
+    try:
+        return array("q", values)
+    except TypeError:  # some values are floats
+        return array("d", values)
+    except OverflowError:
+        raise OverflowError(INT64_OVERFLOW) from None
+
 
 class Matrix(
     MatrixHashMixin,
     SaveMixin,
     ToStringMixin,
 ):
+    """
+    Dense matrix stored row-major in a flat array (8 bytes per element).
+    Rows in .data are zero-copy memoryviews, and the matrix itself exports
+    the buffer protocol: np.asarray(matrix) doesn't copy.
+    """
+
+    __slots__ = ("_storage", "rows", "cols", "_row_digests", "_digest")
     __hash__ = MatrixHashMixin.__hash__
-    matmul_cache: Dict[Tuple[int, int], "Matrix"] = dict()
+    matmul_cache = MatmulCache()
+    # Tile side of blocked multiplication, None - derive from CACHE_BYTES
+    matmul_tile_size: Optional[int] = None
+    # Use Strassen for matrices larger than this, None - never
+    strassen_threshold: Optional[int] = 512
+    # Worker processes for multiplication, 1 - multiply in this process, 0 - all CPUs
+    matmul_jobs: int = 1
+    # Use process pool when result has at least this many elements
+    parallel_min_elements: int = 128 * 128
 
-    def __init__(self, data: List[List[float]]):
+    def __init__(self, data: Sequence[Sequence[float]]):
         self.data = data
-        self.rows = len(data)
-        self.cols = len(data[0]) if isinstance(data, list) else 0
+
+    @classmethod
+    def from_storage(
+        cls, storage: Union[array, memoryview], rows: int, cols: int
+    ) -> "Matrix":
+        """Wrap flat row-major array or 1-D memoryview 'q'/'d' without copying"""
+        if len(storage) != rows * cols:
+            raise ValueError("Storage size doesn't match matrix dimensions")
+        matrix = cls.__new__(cls)
+        matrix._storage = storage
+        matrix.rows = rows
+        matrix.cols = cols
+        matrix.invalidate_digest()
+        return matrix
+
+    @classmethod
+    def load(cls, fpath: Path, verify: bool = False) -> "Matrix":
+        """
+        Read file written by save_binary or save_to_file.
+        Binary elements are not copied: storage is a view of copy-on-write
+        map of the file (see matrix_io.map_binary_storage), so pages are
+        read on first access and copied on first write.
+        Text is parsed in chunks.
+
+        verify: Check checksum of binary file
+        """
+        if matrix_io.is_binary(fpath):
+            storage, rows, cols = matrix_io.map_binary_storage(fpath, verify)
+        else:
+            storage, rows, cols = matrix_io.read_text(fpath)
+        return cls.from_storage(storage, rows, cols)
+
+    @property
+    def storage(self) -> Union[array, memoryview]:
+        """Flat elements: array, or memoryview of mapped file after load"""
+        return self._storage
+
+    @property
+    def typecode(self) -> str:
+        """'q' for int elements, 'd' for float ones"""
+        storage = self._storage
+        return storage.typecode if isinstance(storage, array) else storage.format
+
+    @property
+    def data(self) -> List[memoryview]:
+        return [self.row(i) for i in range(self.rows)]
+
+    @data.setter
+    def data(self, data: Sequence[Sequence[float]]):
+        rows = len(data)
+        cols = len(data[0]) if rows else 0
+        if any(len(row) != cols for row in data):
+            raise ValueError("All rows must have the same length")
+        self._storage = make_storage(list(chain.from_iterable(data)))
+        self.rows = rows
+        self.cols = cols
+        self.invalidate_digest()
+
+    def row(self, i: int) -> memoryview:
+        """Zero-copy view of i-th row"""
+        return memoryview(self._storage)[i * self.cols : (i + 1) * self.cols]
+
+    def __getitem__(self, index: Tuple[int, int]) -> float:
+        i, j = index
+        return self._storage[i * self.cols + j]
+
+    def __setitem__(self, index: Tuple[int, int], value: float):
+        i, j = index
+        if not (0 <= i < self.rows and 0 <= j < self.cols):
+            raise IndexError("Matrix index out of range")
+        try:
+            self._storage[i * self.cols + j] = value
+        except TypeError:  # float into int storage
+            self._storage = array("d", self._storage)
+            self._storage[i * self.cols + j] = value
+        except (OverflowError, ValueError):  # ValueError from memoryview storage
+            raise OverflowError(INT64_OVERFLOW) from None
+        # Only the changed row has to be hashed again
+        if self._row_digests is not None:
+            self._row_digests[i] = None
+        self._digest = None
+
+    def invalidate_digest(self):
+        """Forget cached digests, call after writing through storage/buffer views"""
+        self._row_digests: Optional[List[Optional[bytes]]] = None
+        self._digest: Optional[bytes] = None
+
+    def content_digest(self) -> bytes:
+        """
+        Strong content hash: blake2b over shape, typecode and row digests.
+        Digests are cached per row, so after element writes only the
+        touched rows are hashed again.
+        """
+        if self._digest is not None:
+            return self._digest
+        if self._row_digests is None:
+            self._row_digests = [None] * self.rows
+        for i, row_digest in enumerate(self._row_digests):
+            if row_digest is None:
+                self._row_digests[i] = hashlib.blake2b(
+                    self.row(i), digest_size=16
+                ).digest()
+        header = f"{self.rows}x{self.cols}:{self.typecode}".encode()
+        self._digest = hashlib.blake2b(
+            header + b"".join(self._row_digests), digest_size=32
+        ).digest()
+        return self._digest
+
+    def __reduce__(self):
+        # Mapped storage can't be pickled, elements are sent as array
+        storage = array(self.typecode, self._storage)
+        return type(self).from_storage, (storage, self.rows, self.cols)
+
+    def tolist(self) -> List[List[float]]:
+        return [row.tolist() for row in self.data]
+
+    def lazy(self):
+        """Start deferred expression: operators build a graph, see LazyMatrix"""
+        from lazy_matrix import LazyMatrix
+
+        return LazyMatrix(self)
+
+    def __buffer__(self, flags: int) -> memoryview:
+        """Buffer protocol (PEP 688): 2-D view over the storage"""
+        return (
+            memoryview(self._storage)
+            .cast("B")
+            .cast(self.typecode, (self.rows, self.cols))
+        )
 
     def element_wise_operation(self, other: "Matrix", operation: Callable) -> "Matrix":
         """
@@ -33,43 +227,115 @@ class Matrix(
                 "Matrices must have same dimensions for element-wise operations"
             )
 
-        result = [
-            [operation(self.data[i][j], other.data[i][j]) for j in range(self.cols)]
-            for i in range(self.rows)
-        ]
-        return Matrix(result)
+        result = make_storage(list(map(operation, self._storage, other._storage)))
+        return Matrix.from_storage(result, self.rows, self.cols)
 
     def __add__(self, other: "Matrix") -> "Matrix":
+        if _defers(other):
+            return NotImplemented
         return self.element_wise_operation(other, operator.add)
 
+    def __sub__(self, other: "Matrix") -> "Matrix":
+        if _defers(other):
+            return NotImplemented
+        return self.element_wise_operation(other, operator.sub)
+
     def __mul__(self, other: "Matrix") -> "Matrix":
+        if _defers(other):
+            return NotImplemented
         return self.element_wise_operation(other, operator.mul)
 
+    def _padded_block(self, row: int, col: int, size: int) -> "Matrix":
+        """size x size block starting at (row, col), zero-padded past the edges"""
+        block = array(self.typecode, bytes(8 * size * size))
+        block_view = memoryview(block)
+        width = max(0, min(size, self.cols - col))
+        for i in range(min(size, self.rows - row)):
+            start = (row + i) * self.cols + col
+            block_view[i * size : i * size + width] = self._storage[
+                start : start + width
+            ]
+        return Matrix.from_storage(block, size, size)
+
+    @classmethod
+    def _matmul_blocked(cls, m1: "Matrix", m2: "Matrix") -> "Matrix":
+        """
+        Row-by-column products over a transposed copy of m2, computed tile by tile,
+        so a tile of columns stays in cache while rows of m1 run over it.
+        """
+        rows = [m1.row(i).tolist() for i in range(m1.rows)]
+        cols = [m2._storage[j :: m2.cols].tolist() for j in range(m2.cols)]
+        tile = cls.matmul_tile_size or max(8, CACHE_BYTES // (8 * max(1, m1.cols)))
+
+        result = [[0] * m2.cols for _ in range(m1.rows)]
+        for i0 in range(0, m1.rows, tile):
+            row_tile = rows[i0 : i0 + tile]
+            for j0 in range(0, m2.cols, tile):
+                col_tile = cols[j0 : j0 + tile]
+                for i, row in enumerate(row_tile, i0):
+                    result[i][j0 : j0 + tile] = [sumprod(row, col) for col in col_tile]
+        storage = make_storage(list(chain.from_iterable(result)))
+        return Matrix.from_storage(storage, m1.rows, m2.cols)
+
+    @classmethod
+    def _matmul_strassen(cls, m1: "Matrix", m2: "Matrix") -> "Matrix":
+        """Strassen's 7 multiplications on zero-padded halves, down to threshold"""
+        size = max(m1.rows, m1.cols, m2.cols)
+        if cls.strassen_threshold is None or size <= cls.strassen_threshold:
+            return cls._matmul_blocked(m1, m2)
+
+        half = (size + 1) // 2
+        a11, a12 = m1._padded_block(0, 0, half), m1._padded_block(0, half, half)
+        a21, a22 = m1._padded_block(half, 0, half), m1._padded_block(half, half, half)
+        b11, b12 = m2._padded_block(0, 0, half), m2._padded_block(0, half, half)
+        b21, b22 = m2._padded_block(half, 0, half), m2._padded_block(half, half, half)
+
+        p1 = cls._matmul_strassen(a11 + a22, b11 + b22)
+        p2 = cls._matmul_strassen(a21 + a22, b11)
+        p3 = cls._matmul_strassen(a11, b12 - b22)
+        p4 = cls._matmul_strassen(a22, b21 - b11)
+        p5 = cls._matmul_strassen(a11 + a12, b22)
+        p6 = cls._matmul_strassen(a21 - a11, b11 + b12)
+        p7 = cls._matmul_strassen(a12 - a22, b21 + b22)
+        quadrants = (
+            (p1 + p4 - p5 + p7, p3 + p5),
+            (p2 + p4, p1 - p2 + p3 + p6),
+        )
+
+        # Assemble quadrants cropping the padding
+        left_width, right_width = min(half, m2.cols), max(0, m2.cols - half)
+        result: List[float] = []
+        for i in range(m1.rows):
+            left, right = quadrants[i // half]
+            start = (i % half) * half
+            result.extend(left._storage[start : start + left_width])
+            result.extend(right._storage[start : start + right_width])
+        return Matrix.from_storage(make_storage(result), m1.rows, m2.cols)
+
     @classmethod
     def _matmul_matrices(cls, m1: "Matrix", m2: "Matrix") -> "Matrix":
-        result = [
-            [
-                sum(m1.data[i][k] * m2.data[k][j] for k in range(m1.cols))
-                for j in range(m2.cols)
-            ]
-            for i in range(m1.rows)
-        ]
-        return Matrix(result)
+        if cls.matmul_jobs != 1 and m1.rows * m2.cols >= cls.parallel_min_elements:
+            from parallel_matmul import matmul_parallel
+
+            return matmul_parallel(m1, m2, n_jobs=cls.matmul_jobs)
+        return cls._matmul_strassen(m1, m2)
 
     def __matmul__(self, other) -> "Matrix":
+        if _defers(other):
+            return NotImplemented
         if not isinstance(other, Matrix):
             raise ValueError("Can only matrix multiply Matrix objects")
         if self.cols != other.rows:
             raise ValueError("Invalid dimensions for matrix multiplication")
 
         # Return cached result if available
-        cache_key = (hash(self), hash(other))
-        if cache_key in Matrix.matmul_cache:
-            return Matrix.matmul_cache[cache_key]
+        cached = Matrix.matmul_cache.get(self, other)
+        if cached is not None:
+            return cached
 
         # Calc and add to cache otherwise
         result = self._matmul_matrices(self, other)
-        Matrix.matmul_cache[cache_key] = result
+        Matrix.matmul_cache.put(self, other, result)
         return result
 
     @classmethod
@@ -77,13 +343,14 @@ class Matrix(
         cls.matmul_cache.clear()
 
     def __eq__(self, other) -> bool:
+        if _defers(other):
+            return NotImplemented
         if not isinstance(other, Matrix):
             return False
         if self.rows != other.rows or self.cols != other.cols:
             return False
-        return all(
-            all(row) for row in self.element_wise_operation(other, operator.eq).data
-        )
+        # array comparison is element-wise and works across typecodes
+        return self._storage == other._storage
 
 
 def task_1():
@@ -114,6 +381,7 @@ def task_3_find_collision():
     D = Matrix([[1, 2], [3, 4]])  # Same as B
 
     AB = A @ B
+    # Cache is keyed by content digests, not by __hash__, so it returns true C @ D
     CD_cached = C @ D
     Matrix.clear_cache()
     CD = C @ D
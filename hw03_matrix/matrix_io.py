@@ -0,0 +1,208 @@
+"""
+Matrix files.
+
+Binary format: 64-byte header followed by raw row-major elements.
+The header holds magic, shape, numpy-style dtype string and blake2b checksum
+of the elements, so the data starts aligned and can be memory-mapped as is.
+
+Text format (legacy, what save_to_file writes): one row per line,
+elements separated by spaces. Both are written and read in chunks.
+"""
+
+import hashlib
+import mmap
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import BinaryIO, Iterable, Tuple, Union
+
+MAGIC = b"MATRIX01"
+# magic, rows, cols, dtype, checksum of data
+HEADER = struct.Struct("<8sQQ8s16s")
+HEADER_SIZE = 64
+CHUNK_SIZE = 16 * 1024 * 1024
+DIGEST_SIZE = 16
+
+# Buffer format -> dtype string, buffer formats of array, Matrix and numpy
+DTYPES = {
+    ("q", 8): "<i8",
+    ("l", 8): "<i8",
+    ("i", 4): "<i4",
+    ("l", 4): "<i4",
+    ("d", 8): "<f8",
+    ("f", 4): "<f4",
+}
+# dtype string -> array typecode that holds its values (Matrix keeps q or d)
+TYPECODES = {"<i8": "q", "<i4": "q", "<f8": "d", "<f4": "d"}
+SOURCE_TYPECODES = {"<i8": "q", "<i4": "i", "<f8": "d", "<f4": "f"}
+
+
+def is_binary(fpath: Path) -> bool:
+    with open(fpath, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def write_binary(fpath: Path, view: memoryview):
+    """
+    Stream 2-D buffer into binary file: data goes out in chunks while
+    being hashed, header with checksum is written last.
+    """
+    if view.ndim != 2:
+        raise ValueError("Only 2-D matrices can be saved")
+    key = (view.format.lstrip("<=@"), view.itemsize)
+    if key not in DTYPES:
+        raise ValueError(f"Unsupported element format: {view.format}")
+    rows, cols = view.shape
+    data = view.cast("B") if view.c_contiguous else memoryview(view.tobytes())
+
+    digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    with open(fpath, "wb") as f:
+        f.write(bytes(HEADER_SIZE))
+        for start in range(0, len(data), CHUNK_SIZE):
+            chunk = data[start : start + CHUNK_SIZE]
+            digest.update(chunk)
+            f.write(chunk)
+        f.seek(0)
+        dtype = DTYPES[key].encode()
+        f.write(HEADER.pack(MAGIC, rows, cols, dtype, digest.digest()))
+
+
+def read_header(f: BinaryIO) -> Tuple[int, int, str, bytes]:
+    """rows, cols, dtype and checksum of binary matrix file"""
+    raw = f.read(HEADER_SIZE)
+    if len(raw) < HEADER_SIZE:
+        raise ValueError("Truncated matrix file header")
+    magic, rows, cols, dtype, digest = HEADER.unpack_from(raw)
+    dtype = dtype.rstrip(b"\0").decode()
+    if magic != MAGIC or dtype not in TYPECODES:
+        raise ValueError("Not a binary matrix file")
+    return rows, cols, dtype, digest
+
+
+def map_binary(fpath: Path, verify: bool = False) -> Tuple[mmap.mmap, int, int, str]:
+    """
+    Memory-map binary matrix file, pages are read on first access.
+    The map is copy-on-write: writes to it never reach the file.
+
+    verify: Check the checksum, reads the whole file
+    return: map, rows, cols, dtype; elements start at HEADER_SIZE
+    """
+    with open(fpath, "rb") as f:
+        rows, cols, dtype, digest = read_header(f)
+        size = HEADER_SIZE + rows * cols * struct.calcsize(SOURCE_TYPECODES[dtype])
+        if f.seek(0, 2) < size:
+            raise ValueError("Truncated matrix file data")
+        mm = mmap.mmap(f.fileno(), size, access=mmap.ACCESS_COPY)
+    if verify:
+        data = memoryview(mm)[HEADER_SIZE:]
+        actual = hashlib.blake2b(data, digest_size=DIGEST_SIZE)
+        data.release()
+        if actual.digest() != digest:
+            mm.close()
+            raise ValueError("Matrix file checksum mismatch")
+    return mm, rows, cols, dtype
+
+
+def create_binary(fpath: Path, rows: int, cols: int, dtype: str) -> mmap.mmap:
+    """
+    Preallocate binary matrix file and map it writable.
+    Checksum in header stays empty until finish_binary is called.
+    """
+    if dtype not in SOURCE_TYPECODES:
+        raise ValueError(f"Unsupported dtype: {dtype}")
+    size = HEADER_SIZE + rows * cols * struct.calcsize(SOURCE_TYPECODES[dtype])
+    with open(fpath, "w+b") as f:
+        f.truncate(size)
+        f.write(HEADER.pack(MAGIC, rows, cols, dtype.encode(), bytes(DIGEST_SIZE)))
+        return mmap.mmap(f.fileno(), size)
+
+
+def finish_binary(fpath: Path):
+    """Hash elements of file filled through create_binary and store checksum"""
+    digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    with open(fpath, "r+b") as f:
+        read_header(f)
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
+        f.seek(HEADER.size - DIGEST_SIZE)
+        f.write(digest.digest())
+
+
+def read_binary_storage(fpath: Path, verify: bool = False) -> Tuple[array, int, int]:
+    """Elements of binary matrix file as array('q') or array('d')"""
+    mm, rows, cols, dtype = map_binary(fpath, verify)
+    with mm:
+        data = memoryview(mm)[HEADER_SIZE:]
+        storage = array(SOURCE_TYPECODES[dtype])
+        storage.frombytes(data)
+        data.release()
+    if storage.typecode != TYPECODES[dtype]:
+        storage = array(TYPECODES[dtype], storage)
+    return storage, rows, cols
+
+
+def map_binary_storage(
+    fpath: Path, verify: bool = False
+) -> Tuple[Union[memoryview, array], int, int]:
+    """
+    Elements of binary matrix file as memoryview cast to 'q' or 'd' over
+    its copy-on-write map: pages are read on first access, a page written
+    through the view is copied privately then, the file never changes.
+    4-byte elements and big-endian machines need conversion, those files
+    are copied into array by read_binary_storage.
+    """
+    mm, rows, cols, dtype = map_binary(fpath, verify)
+    typecode = TYPECODES[dtype]
+    if typecode != SOURCE_TYPECODES[dtype] or sys.byteorder != "little":
+        mm.close()
+        return read_binary_storage(fpath)
+    # The view keeps the map open as long as it is referenced
+    data = memoryview(mm)[HEADER_SIZE : HEADER_SIZE + rows * cols * 8]
+    return data.cast(typecode), rows, cols
+
+
+def write_text(fpath: Path, rows: Iterable[Iterable]):
+    """Write rows as space-separated lines, joined in chunks of rows"""
+    with open(fpath, "w") as f:
+        lines = []
+        size = 0
+        separator = ""
+        for row in rows:
+            line = " ".join(map(str, row))
+            lines.append(line)
+            size += len(line)
+            if size >= CHUNK_SIZE:
+                f.write(separator + "\n".join(lines))
+                lines, size, separator = [], 0, "\n"
+        if lines:
+            f.write(separator + "\n".join(lines))
+
+
+def read_text(fpath: Path) -> Tuple[array, int, int]:
+    """
+    Parse space-separated text matrix chunk by chunk.
+    Elements go to array('q') while all of them are ints, array('d') otherwise.
+    """
+    storage = array("q")
+    rows = 0
+    cols = None
+    with open(fpath) as f:
+        while chunk := f.readlines(CHUNK_SIZE):
+            lines = [line for line in chunk if line.strip()]
+            if not lines:
+                continue
+            if cols is None:
+                cols = len(lines[0].split())
+            tokens = " ".join(lines).split()
+            if len(tokens) != len(lines) * cols:
+                raise ValueError("All rows must have the same length")
+            if storage.typecode == "q":
+                try:
+                    storage.extend(list(map(int, tokens)))
+                except ValueError:
+                    storage = array("d", storage)
+            if storage.typecode == "d":
+                storage.extend(map(float, tokens))
+            rows += len(lines)
+    return storage, rows, cols or 0
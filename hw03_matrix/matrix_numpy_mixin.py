@@ -1,10 +1,12 @@
 from numbers import Number
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Union
 
 import numpy as np
 from numpy.lib.mixins import NDArrayOperatorsMixin
+from numpy.typing import DTypeLike
 
+import matrix_io
 from mixins import SaveMixin, ToStringMixin
 
 
@@ -13,12 +15,50 @@ class MatrixNumpy(
     ToStringMixin,
     NDArrayOperatorsMixin,
 ):
+    """
+    Matrix over numpy array. Wraps ndarray (or any buffer, e.g. Matrix)
+    without copying, results of operations wrap ufunc outputs as they are,
+    and out= / in-place operators (+=, *=) write into existing buffers.
+    """
+
     _HANDLED_TYPES = (np.ndarray, Number)
 
-    def __init__(self, data: List[List[float]]):
-        self._data = np.array(data)
-        self.rows = len(data)
-        self.cols = len(data[0]) if isinstance(data, list) else 0
+    def __init__(
+        self,
+        data: Union[List[List[float]], np.ndarray],
+        dtype: DTypeLike = None,
+        copy: bool = False,
+    ):
+        self._set_data(np.array(data, dtype=dtype) if copy else np.asarray(data, dtype))
+
+    def _set_data(self, data: np.ndarray):
+        self._data = data
+        self.rows, self.cols = (data.shape + (0, 0))[:2]
+
+    @classmethod
+    def _wrap(cls, data: np.ndarray) -> "MatrixNumpy":
+        matrix = cls.__new__(cls)
+        matrix._set_data(data)
+        return matrix
+
+    @classmethod
+    def load(cls, fpath: Path, verify: bool = False) -> "MatrixNumpy":
+        """
+        Read file written by save_binary or save_to_file.
+        Binary file is memory-mapped copy-on-write: pages are read lazily
+        and the array uses the map without copying.
+
+        verify: Check checksum of binary file, reads it whole
+        """
+        if matrix_io.is_binary(fpath):
+            mm, rows, cols, dtype = matrix_io.map_binary(fpath, verify)
+            data = np.frombuffer(
+                mm, dtype=dtype, count=rows * cols, offset=matrix_io.HEADER_SIZE
+            )
+        else:
+            storage, rows, cols = matrix_io.read_text(fpath)
+            data = np.frombuffer(storage, dtype=storage.typecode)
+        return cls._wrap(data.reshape(rows, cols))
 
     @property
     def data(self):
@@ -28,6 +68,28 @@ class MatrixNumpy(
     def shape(self):
         return self.rows, self.cols
 
+    @property
+    def dtype(self) -> np.dtype:
+        return self._data.dtype
+
+    def __array__(self, dtype: DTypeLike = None, copy: Optional[bool] = None):
+        """np.asarray(matrix) returns the wrapped array itself"""
+        if copy:
+            return np.array(self._data, dtype=dtype)
+        return np.asarray(self._data, dtype=dtype)
+
+    def __buffer__(self, flags: int) -> memoryview:
+        """Buffer protocol (PEP 688), copies only non-contiguous arrays"""
+        return memoryview(np.ascontiguousarray(self._data))
+
+    def _wrap_result(self, result):
+        """Wrap 2-D arrays, leave scalars and reduced arrays as they are"""
+        if type(result) is tuple:
+            return tuple(self._wrap_result(x) for x in result)
+        if isinstance(result, np.ndarray) and result.ndim == 2:
+            return type(self)._wrap(result)
+        return result
+
     def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
         """Adopted example from docs: https://numpy.org/doc/stable/reference/generated/numpy.lib.mixins.NDArrayOperatorsMixin.html"""
         out = kwargs.get("out", ())
@@ -46,15 +108,35 @@ class MatrixNumpy(
                 x._data if isinstance(x, MatrixNumpy) else x for x in out
             )
         result = getattr(ufunc, method)(*inputs, **kwargs)
-        if type(result) is tuple:
-            # multiple return values
-            return tuple(type(self)(x) for x in result)
+        if out:
+            # Result was written into out buffers (also for += and *=):
+            # return the out objects themselves, no new wrapper
+            return out[0] if len(out) == 1 else out
         elif method == "at":
             # no return value
             return None
         else:
-            # one return value
-            return type(self)(result)
+            return self._wrap_result(result)
+
+    def __array_function__(self, func, types, args, kwargs):
+        """numpy functions (np.sum, np.mean, np.dot, ...) on the wrapped arrays"""
+        if not all(issubclass(t, (np.ndarray, MatrixNumpy)) for t in types):
+            return NotImplemented
+        result = func(*_unwrap(args), **_unwrap(kwargs))
+        if isinstance(kwargs.get("out"), MatrixNumpy):
+            return kwargs["out"]
+        return self._wrap_result(result)
+
+
+def _unwrap(value):
+    """Replace MatrixNumpy with its array inside (nested) args of numpy function"""
+    if isinstance(value, MatrixNumpy):
+        return value._data
+    if isinstance(value, (list, tuple)):
+        return type(value)(_unwrap(x) for x in value)
+    if isinstance(value, dict):
+        return {key: _unwrap(x) for key, x in value.items()}
+    return value
 
 
 def task_2():
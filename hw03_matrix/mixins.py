@@ -1,8 +1,12 @@
 from functools import reduce
 from pathlib import Path
 
+from matrix_io import write_binary, write_text
+
 
 class MatrixHashMixin:
+    __slots__ = ()
+
     def __hash__(self) -> int:
         elem_product = reduce(
             lambda x, y: x * y, [x for row in self.data for x in row], 1
@@ -11,11 +15,22 @@ class MatrixHashMixin:
 
 
 class SaveMixin:
+    __slots__ = ()
+
     def save_to_file(self, fpath: Path):
+        """Save as text, same as str(self) but written row by row"""
         fpath.parent.mkdir(parents=True, exist_ok=True)  # Create dir
-        fpath.write_text(str(self))
+        write_text(fpath, self.data)
+
+    def save_binary(self, fpath: Path):
+        """Save header and raw elements (see matrix_io), object must export buffer"""
+        fpath.parent.mkdir(parents=True, exist_ok=True)
+        with memoryview(self) as view:
+            write_binary(fpath, view)
 
 
 class ToStringMixin:
+    __slots__ = ()
+
     def __str__(self) -> str:
         return "\n".join([" ".join(map(str, row)) for row in self.data])
@@ -0,0 +1,315 @@
+"""
+Out-of-core matrix operations on binary matrix files (see matrix_io).
+
+Operands stay memory-mapped on disk, @, + and * stream them tile by tile
+through a working set bounded by memory_budget and write the result tile by
+tile into a new file. Results of operators live in temporary files removed
+when the result is closed or dropped. Tiles are read on a background thread while the
+previous ones are computed.
+"""
+
+import math
+import os
+import queue
+import tempfile
+import threading
+import weakref
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+
+import matrix_io
+from matrix import Matrix
+
+MEMORY_BUDGET = 256 * 1024 * 1024
+PREFETCH_DEPTH = 2
+
+Tile = Tuple[np.ndarray, ...]
+
+
+class Prefetcher:
+    """
+    Run loads on background thread, keeping at most depth results ahead
+    of the consumer. Exceptions of loads are raised in the consumer.
+    """
+
+    _DONE = object()
+
+    def __init__(
+        self, loads: Iterable[Callable[[], Tile]], depth: int = PREFETCH_DEPTH
+    ):
+        self._loads = loads
+        self._queue: queue.Queue = queue.Queue(maxsize=depth)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _put(self, item) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self):
+        try:
+            for load in self._loads:
+                if not self._put((load(), None)):
+                    return
+        except BaseException as e:
+            self._put((None, e))
+            return
+        self._put((self._DONE, None))
+
+    def __iter__(self) -> Iterator[Tile]:
+        try:
+            while True:
+                item, error = self._queue.get()
+                if error is not None:
+                    raise error
+                if item is self._DONE:
+                    return
+                yield item
+        finally:
+            self._stop.set()
+            self._thread.join()
+
+
+class DiskMatrix:
+    """
+    Matrix in binary matrix file, memory-mapped copy-on-write.
+    Pages are read only when tiles touching them are requested.
+    """
+
+    # Bytes of tiles held at once by operations, including prefetched ones
+    memory_budget: int = MEMORY_BUDGET
+
+    def __init__(self, fpath: Path):
+        self.fpath = Path(fpath)
+        self._remove_file: Optional[weakref.finalize] = None
+        self._mm, self.rows, self.cols, dtype = matrix_io.map_binary(self.fpath)
+        self.dtype = np.dtype(dtype)
+        self.array = np.frombuffer(
+            self._mm,
+            dtype=self.dtype,
+            count=self.rows * self.cols,
+            offset=matrix_io.HEADER_SIZE,
+        ).reshape(self.rows, self.cols)
+
+    @classmethod
+    def from_matrix(cls, matrix, fpath: Path) -> "DiskMatrix":
+        """Save Matrix/MatrixNumpy to binary file and open it"""
+        matrix.save_binary(Path(fpath))
+        return cls(fpath)
+
+    def to_matrix(self) -> Matrix:
+        return Matrix.load(self.fpath)
+
+    def close(self):
+        """Unmap the file, remove it if it is a temporary result"""
+        self.array = None
+        self._mm.close()
+        if self._remove_file is not None:
+            self._remove_file()
+
+    def __enter__(self) -> "DiskMatrix":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.rows, self.cols
+
+    def tile(self, rows: slice, cols: slice) -> np.ndarray:
+        """Copy of the tile: reads its pages from disk"""
+        return np.array(self.array[rows, cols])
+
+    def _temp_path(self, op: str) -> Path:
+        fd, name = tempfile.mkstemp(
+            prefix=f"{self.fpath.stem}.{op}.", suffix=".bin", dir=self.fpath.parent
+        )
+        os.close(fd)
+        return Path(name)
+
+    def _temporary_result(self, operation: Callable, other: "DiskMatrix"):
+        """Result of operation in temporary file, removed together with it"""
+        out_path = self._temp_path(operation.__name__)
+        try:
+            result = operation(self, other, out_path, self.memory_budget)
+        except BaseException:
+            out_path.unlink(missing_ok=True)
+            raise
+        # Unlinking a mapped file is fine, pages stay valid until unmapped
+        result._remove_file = weakref.finalize(result, out_path.unlink, missing_ok=True)
+        return result
+
+    def __add__(self, other: "DiskMatrix") -> "DiskMatrix":
+        return self._temporary_result(add, other)
+
+    def __mul__(self, other: "DiskMatrix") -> "DiskMatrix":
+        return self._temporary_result(mul, other)
+
+    def __matmul__(self, other: "DiskMatrix") -> "DiskMatrix":
+        return self._temporary_result(matmul, other)
+
+
+def _result_dtype(m1: DiskMatrix, m2: DiskMatrix) -> str:
+    return np.result_type(m1.dtype, m2.dtype).newbyteorder("<").str
+
+
+def _write_result(
+    out_path: Path,
+    rows: int,
+    cols: int,
+    dtype: str,
+    tiles: Iterable[Tuple[slice, slice, np.ndarray]],
+) -> DiskMatrix:
+    """Write (rows, cols, tile) into new binary file, then open it"""
+    mm = matrix_io.create_binary(out_path, rows, cols, dtype)
+    with mm:
+        out = np.frombuffer(
+            mm, dtype=dtype, count=rows * cols, offset=matrix_io.HEADER_SIZE
+        ).reshape(rows, cols)
+        for row_slice, col_slice, tile in tiles:
+            out[row_slice, col_slice] = tile
+        del out
+        mm.flush()
+    matrix_io.finish_binary(out_path)
+    return DiskMatrix(out_path)
+
+
+def _bands(size: int, step: int) -> list:
+    return [slice(start, min(start + step, size)) for start in range(0, size, step)]
+
+
+def element_wise(
+    m1: DiskMatrix,
+    m2: DiskMatrix,
+    operation: Callable,
+    out_path: Path,
+    memory_budget: Optional[int] = None,
+) -> DiskMatrix:
+    """
+    Apply numpy operation to bands of rows.
+    Working set: bands of both operands, prefetched bands and result band.
+    """
+    if m1.shape != m2.shape:
+        raise ValueError(
+            "Matrices must have same dimensions for element-wise operations"
+        )
+    dtype = _result_dtype(m1, m2)
+    budget = memory_budget or DiskMatrix.memory_budget
+    row_bytes = max(1, m1.cols) * np.dtype(dtype).itemsize
+    n_bands = 2 * (PREFETCH_DEPTH + 1) + 1
+    bands = _bands(m1.rows, max(1, budget // (n_bands * row_bytes)))
+    all_cols = slice(0, m1.cols)
+
+    loads = (
+        lambda band=band: (m1.tile(band, all_cols), m2.tile(band, all_cols))
+        for band in bands
+    )
+
+    def tiles():
+        prefetched = iter(Prefetcher(loads))
+        try:
+            for band in bands:
+                a, b = next(prefetched)
+                yield band, all_cols, operation(a, b)
+        finally:
+            prefetched.close()
+
+    return _write_result(out_path, m1.rows, m1.cols, dtype, tiles())
+
+
+def add(m1: DiskMatrix, m2: DiskMatrix, out_path: Path, memory_budget=None):
+    return element_wise(m1, m2, np.add, out_path, memory_budget)
+
+
+def mul(m1: DiskMatrix, m2: DiskMatrix, out_path: Path, memory_budget=None):
+    return element_wise(m1, m2, np.multiply, out_path, memory_budget)
+
+
+def matmul(
+    m1: DiskMatrix,
+    m2: DiskMatrix,
+    out_path: Path,
+    memory_budget: Optional[int] = None,
+) -> DiskMatrix:
+    """
+    Blocked product: tile (i, j) of result accumulates A[i, k] @ B[k, j]
+    over k while the next pairs of tiles are being read.
+    Working set: current and prefetched pairs, accumulator and product.
+    """
+    if m1.cols != m2.rows:
+        raise ValueError("Invalid dimensions for matrix multiplication")
+    dtype = _result_dtype(m1, m2)
+    budget = memory_budget or DiskMatrix.memory_budget
+    n_tiles = 2 * (PREFETCH_DEPTH + 1) + 2
+    tile = max(1, math.isqrt(budget // (n_tiles * np.dtype(dtype).itemsize)))
+    row_bands = _bands(m1.rows, tile)
+    col_bands = _bands(m2.cols, tile)
+    inner_bands = _bands(m1.cols, tile)
+
+    loads = (
+        lambda i=i, j=j, k=k: (m1.tile(i, k), m2.tile(k, j))
+        for i in row_bands
+        for j in col_bands
+        for k in inner_bands
+    )
+
+    def tiles():
+        prefetched = iter(Prefetcher(loads))
+        try:
+            for i in row_bands:
+                for j in col_bands:
+                    shape = (i.stop - i.start, j.stop - j.start)
+                    accumulator = np.zeros(shape, dtype)
+                    for _ in inner_bands:
+                        a, b = next(prefetched)
+                        accumulator += a @ b
+                    yield i, j, accumulator
+        finally:
+            prefetched.close()
+
+    return _write_result(out_path, m1.rows, m2.cols, dtype, tiles())
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Out-of-core timing")
+    parser.add_argument("-n", type=int, default=4000, help="Matrix size n x n")
+    parser.add_argument("--budget-mb", type=int, default=64, help="Memory budget")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        paths = []
+        for name in ("a", "b"):
+            # Filled through the map in bands, never fully in memory
+            path = tmp / f"{name}.bin"
+            mm = matrix_io.create_binary(path, args.n, args.n, "<f8")
+            with mm:
+                out = np.frombuffer(mm, offset=matrix_io.HEADER_SIZE)
+                out = out.reshape(args.n, args.n)
+                for band in _bands(args.n, 256):
+                    out[band] = rng.random((band.stop - band.start, args.n))
+                del out
+            matrix_io.finish_binary(path)
+            paths.append(path)
+
+        budget = args.budget_mb * 1024 * 1024
+        print(f"Memory budget {args.budget_mb} MB")
+        with DiskMatrix(paths[0]) as a, DiskMatrix(paths[1]) as b:
+            for name, func in (("add", add), ("mul", mul), ("matmul", matmul)):
+                start_time = time.perf_counter()
+                func(a, b, tmp / f"{name}.bin", budget).close()
+                elapsed = time.perf_counter() - start_time
+                print(f"{name:<8} {args.n}x{args.n}: {elapsed:.2f}s")
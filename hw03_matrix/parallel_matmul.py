@@ -0,0 +1,187 @@
+import atexit
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import cpu_count, shared_memory
+from typing import Dict, List, Tuple
+
+from matrix import INT64_OVERFLOW, Matrix, sumprod
+
+# Shared blocks attached in worker process and transposed B, by block name
+_worker_blocks: Dict[str, shared_memory.SharedMemory] = {}
+_worker_columns: Dict[str, List[list]] = {}
+
+_executors: Dict[int, ProcessPoolExecutor] = {}
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """
+    Attach to shared block once per worker; owner process unlinks it.
+    Workers share resource tracker of the owner, so registration made by
+    attaching is dropped when the owner unlinks the block.
+    """
+    if name not in _worker_blocks:
+        _worker_blocks[name] = shared_memory.SharedMemory(name=name)
+    return _worker_blocks[name]
+
+
+def _release_worker_blocks(keep: Tuple[str, ...]):
+    for name in list(_worker_blocks):
+        if name not in keep:
+            _worker_columns.pop(name, None)
+            _worker_blocks.pop(name).close()
+
+
+def _matmul_rows(
+    a_spec: Tuple[str, str, int, int],
+    b_spec: Tuple[str, str, int, int],
+    out_spec: Tuple[str, str],
+    row_start: int,
+    row_end: int,
+):
+    """Worker: compute rows [row_start, row_end) of A @ B into shared result"""
+    a_name, a_typecode, _, k = a_spec
+    b_name, b_typecode, _, m = b_spec
+    out_name, out_typecode = out_spec
+    _release_worker_blocks((a_name, b_name, out_name))
+
+    a = _attach(a_name).buf.cast(a_typecode)
+    if b_name not in _worker_columns:
+        b = _attach(b_name).buf.cast(b_typecode)
+        _worker_columns[b_name] = [b[j::m].tolist() for j in range(m)]
+        b.release()
+    columns = _worker_columns[b_name]
+    out = _attach(out_name).buf.cast(out_typecode)
+
+    try:
+        for i in range(row_start, row_end):
+            row = a[i * k : (i + 1) * k].tolist()
+            out[i * m : (i + 1) * m] = array(
+                out_typecode, [sumprod(row, col) for col in columns]
+            )
+    except OverflowError:
+        raise OverflowError(INT64_OVERFLOW) from None
+    finally:
+        a.release()
+        out.release()
+
+
+def get_executor(n_jobs: int) -> ProcessPoolExecutor:
+    """Persistent pool per number of workers, reused between calls"""
+    if n_jobs not in _executors:
+        _executors[n_jobs] = ProcessPoolExecutor(max_workers=n_jobs)
+    return _executors[n_jobs]
+
+
+@atexit.register
+def shutdown_executors():
+    for executor in _executors.values():
+        executor.shutdown()
+    _executors.clear()
+
+
+def _to_shared(matrix: Matrix) -> shared_memory.SharedMemory:
+    size = max(1, matrix.storage.itemsize * len(matrix.storage))
+    block = shared_memory.SharedMemory(create=True, size=size)
+    block.buf[: len(matrix.storage) * matrix.storage.itemsize] = memoryview(
+        matrix.storage
+    ).cast("B")
+    return block
+
+
+def matmul_parallel(m1: Matrix, m2: Matrix, n_jobs: int = 0) -> Matrix:
+    """
+    Multiply matrices in process pool over shared memory.
+    Operands are copied into shared memory once, workers compute blocks of rows
+    and write them straight into shared result buffer.
+
+    n_jobs: Number of workers, 0 - number of CPUs
+    """
+    if m1.cols != m2.rows:
+        raise ValueError("Invalid dimensions for matrix multiplication")
+    n_jobs = n_jobs or cpu_count()
+    out_typecode = "q" if m1.typecode == m2.typecode == "q" else "d"
+    out_len = m1.rows * m2.cols
+
+    blocks = [_to_shared(m1), _to_shared(m2)]
+    blocks.append(shared_memory.SharedMemory(create=True, size=max(1, 8 * out_len)))
+    a_block, b_block, out_block = blocks
+    try:
+        a_spec = (a_block.name, m1.typecode, m1.rows, m1.cols)
+        b_spec = (b_block.name, m2.typecode, m2.rows, m2.cols)
+        out_spec = (out_block.name, out_typecode)
+
+        # Several blocks per worker to even out their load
+        n_blocks = min(m1.rows, n_jobs * 4) or 1
+        bounds = [m1.rows * i // n_blocks for i in range(n_blocks + 1)]
+        executor = get_executor(n_jobs)
+        futures = [
+            executor.submit(_matmul_rows, a_spec, b_spec, out_spec, start, end)
+            for start, end in zip(bounds[:-1], bounds[1:])
+            if end > start
+        ]
+        for future in futures:
+            future.result()
+
+        result = array(out_typecode)
+        result.frombytes(out_block.buf[: 8 * out_len])
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+    return Matrix.from_storage(result, m1.rows, m2.cols)
+
+
+def compare_execution_times(n: int = 1000) -> List[Dict[str, float]]:
+    """Time sequential and parallel multiplication of n x n matrices"""
+    import numpy as np
+
+    np.random.seed(0)
+    a = Matrix(np.random.random((n, n)).tolist())
+    b = Matrix(np.random.random((n, n)).tolist())
+
+    start_time = time.perf_counter()
+    expected = Matrix._matmul_blocked(a, b)
+    sequential_time = time.perf_counter() - start_time
+    print(f"n={n}, sequential time: {sequential_time:.3f}s")
+
+    results = []
+    for n_jobs in range(1, cpu_count() * 2 + 1):
+        matmul_parallel(a, b, n_jobs=n_jobs)  # warm up workers
+        start_time = time.perf_counter()
+        result = matmul_parallel(a, b, n_jobs=n_jobs)
+        parallel_time = time.perf_counter() - start_time
+        assert result.storage == expected.storage
+
+        results.append(
+            {
+                "n_jobs": n_jobs,
+                "sequential_time": sequential_time,
+                "parallel_time": parallel_time,
+                "speedup": sequential_time / parallel_time,
+            }
+        )
+        print(
+            f"n_jobs={n_jobs}: parallel time {parallel_time:.3f}s, "
+            f"speedup {sequential_time / parallel_time:.2f}x"
+        )
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+    import csv
+    from pathlib import Path
+
+    parser = argparse.ArgumentParser(description="Parallel matmul benchmark")
+    parser.add_argument("-n", type=int, default=1000, help="Matrix size n x n")
+    args = parser.parse_args()
+
+    results = compare_execution_times(args.n)
+    artifacts_dir = Path("artifacts") / "parallel_matmul"
+    artifacts_dir.mkdir(parents=True, exist_ok=True)
+    with open(artifacts_dir / "execution_comparison.csv", "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(results[0]))
+        writer.writeheader()
+        writer.writerows(results)
+    print(f"Saved to {artifacts_dir / 'execution_comparison.csv'}")
@@ -0,0 +1,389 @@
+import hashlib
+import operator
+from array import array
+from itertools import repeat
+from numbers import Number
+from pathlib import Path
+from typing import Dict, Iterator, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from matrix import Matrix, make_storage
+from matrix_numpy_mixin import MatrixNumpy
+from mixins import SaveMixin, ToStringMixin
+
+DenseMatrix = Union[Matrix, MatrixNumpy]
+
+
+class SparseMatrix(
+    SaveMixin,
+    ToStringMixin,
+):
+    """
+    Sparse matrix in CSR format: nonzero elements of row i have column indices
+    indices[indptr[i]:indptr[i + 1]] (sorted) and values at the same positions.
+    Memory and operations take O(rows + nnz), zeros are never stored.
+    """
+
+    __slots__ = ("values", "indices", "indptr", "rows", "cols", "_digest")
+    # Make numpy operators of MatrixNumpy defer to __radd__/__rmul__/__rmatmul__
+    __array_ufunc__ = None
+
+    def __init__(self, data: Sequence[Sequence[float]]):
+        rows = len(data)
+        cols = len(data[0]) if rows else 0
+        if any(len(row) != cols for row in data):
+            raise ValueError("All rows must have the same length")
+        values = []
+        indices = array("q")
+        indptr = array("q", [0])
+        for row in data:
+            for j, x in enumerate(row):
+                if x:
+                    indices.append(j)
+                    values.append(x)
+            indptr.append(len(indices))
+        self._set_csr(make_storage(values), indices, indptr, rows, cols)
+
+    def _set_csr(
+        self, values: array, indices: array, indptr: array, rows: int, cols: int
+    ):
+        self.values = values
+        self.indices = indices
+        self.indptr = indptr
+        self.rows = rows
+        self.cols = cols
+        self._digest = None
+
+    @classmethod
+    def from_csr(
+        cls, values: array, indices: array, indptr: array, rows: int, cols: int
+    ) -> "SparseMatrix":
+        """
+        Wrap CSR arrays without copying.
+        Column indices must be sorted within rows and values must be nonzero.
+        """
+        if len(indptr) != rows + 1 or not len(values) == len(indices) == indptr[-1]:
+            raise ValueError("CSR arrays don't match matrix dimensions")
+        matrix = cls.__new__(cls)
+        matrix._set_csr(values, indices, indptr, rows, cols)
+        return matrix
+
+    @classmethod
+    def _from_row_dicts(
+        cls, row_dicts: List[Dict[int, float]], rows: int, cols: int
+    ) -> "SparseMatrix":
+        """Build from {column: value} per row, dropping zeros"""
+        values = []
+        indices = array("q")
+        indptr = array("q", [0])
+        for row in row_dicts:
+            for j in sorted(row):
+                if row[j]:
+                    indices.append(j)
+                    values.append(row[j])
+            indptr.append(len(indices))
+        return cls.from_csr(make_storage(values), indices, indptr, rows, cols)
+
+    @classmethod
+    def from_coo(
+        cls,
+        row_indices: Sequence[int],
+        col_indices: Sequence[int],
+        values: Sequence[float],
+        rows: int,
+        cols: int,
+    ) -> "SparseMatrix":
+        """Build from coordinate triplets, duplicates are summed"""
+        row_dicts: List[Dict[int, float]] = [{} for _ in range(rows)]
+        for i, j, x in zip(row_indices, col_indices, values):
+            if not (0 <= i < rows and 0 <= j < cols):
+                raise IndexError("Matrix index out of range")
+            row = row_dicts[i]
+            row[j] = row.get(j, 0) + x
+        return cls._from_row_dicts(row_dicts, rows, cols)
+
+    @classmethod
+    def from_dense(
+        cls, matrix: Union[DenseMatrix, Sequence[Sequence[float]]]
+    ) -> "SparseMatrix":
+        if isinstance(matrix, Matrix):
+            return cls(matrix.data)
+        if isinstance(matrix, MatrixNumpy):
+            dense = matrix.data
+            row_indices, col_indices = np.nonzero(dense)
+            indptr = np.zeros(dense.shape[0] + 1, dtype=np.int64)
+            row_counts = np.bincount(row_indices, minlength=dense.shape[0])
+            np.cumsum(row_counts, out=indptr[1:])
+            return cls.from_csr(
+                make_storage(dense[row_indices, col_indices].tolist()),
+                array("q", col_indices.tolist()),
+                array("q", indptr.tolist()),
+                *dense.shape,
+            )
+        return cls(matrix)
+
+    def to_coo(self) -> Tuple[array, array, array]:
+        """Row indices, column indices and values of nonzero elements"""
+        row_indices = array("q")
+        for i in range(self.rows):
+            row_indices.extend([i] * (self.indptr[i + 1] - self.indptr[i]))
+        values = array(self.values.typecode, self.values)
+        return row_indices, array("q", self.indices), values
+
+    def to_matrix(self) -> Matrix:
+        storage = array(self.values.typecode, [0]) * (self.rows * self.cols)
+        for i in range(self.rows):
+            offset = i * self.cols
+            for j, x in self.row_items(i):
+                storage[offset + j] = x
+        return Matrix.from_storage(storage, self.rows, self.cols)
+
+    def to_numpy(self) -> MatrixNumpy:
+        return MatrixNumpy(self._to_ndarray())
+
+    def _to_ndarray(self) -> np.ndarray:
+        dtype = np.int64 if self.values.typecode == "q" else np.float64
+        dense = np.zeros((self.rows, self.cols), dtype=dtype)
+        dense[self._row_indices_np(), np.asarray(self.indices)] = self.values
+        return dense
+
+    def _row_indices_np(self) -> np.ndarray:
+        return np.repeat(np.arange(self.rows), np.diff(np.asarray(self.indptr)))
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.rows, self.cols
+
+    @property
+    def nnz(self) -> int:
+        return len(self.values)
+
+    @property
+    def data(self) -> Iterator[List[float]]:
+        """Dense rows, built one at a time"""
+        return (self.dense_row(i) for i in range(self.rows))
+
+    def row_items(self, i: int) -> Iterator[Tuple[int, float]]:
+        """(column, value) of nonzero elements of i-th row"""
+        start, end = self.indptr[i], self.indptr[i + 1]
+        return zip(self.indices[start:end], self.values[start:end])
+
+    def dense_row(self, i: int) -> List[float]:
+        row = [0.0 if self.values.typecode == "d" else 0] * self.cols
+        for j, x in self.row_items(i):
+            row[j] = x
+        return row
+
+    def __getitem__(self, index: Tuple[int, int]) -> float:
+        i, j = index
+        return dict(self.row_items(i)).get(j, 0)
+
+    def transpose(self) -> "SparseMatrix":
+        """CSR of the transposed matrix, O(rows + cols + nnz)"""
+        counts = [0] * (self.cols + 1)
+        for j in self.indices:
+            counts[j + 1] += 1
+        for j in range(self.cols):
+            counts[j + 1] += counts[j]
+        indptr = array("q", counts)
+        indices = array("q", [0]) * self.nnz
+        values = array(self.values.typecode, [0]) * self.nnz
+        for i in range(self.rows):
+            for j, x in self.row_items(i):
+                position = counts[j]
+                indices[position] = i
+                values[position] = x
+                counts[j] += 1
+        return SparseMatrix.from_csr(values, indices, indptr, self.cols, self.rows)
+
+    def _check_shape(self, other):
+        if (self.rows, self.cols) != (other.rows, other.cols):
+            raise ValueError(
+                "Matrices must have same dimensions for element-wise operations"
+            )
+
+    def __add__(self, other) -> Union["SparseMatrix", DenseMatrix]:
+        """Sparse + sparse is sparse, sparse + dense is dense"""
+        if isinstance(other, SparseMatrix):
+            self._check_shape(other)
+            row_dicts = []
+            for i in range(self.rows):
+                row = dict(self.row_items(i))
+                for j, x in other.row_items(i):
+                    row[j] = row.get(j, 0) + x
+                row_dicts.append(row)
+            return SparseMatrix._from_row_dicts(row_dicts, self.rows, self.cols)
+        if isinstance(other, Matrix):
+            self._check_shape(other)
+            is_int = other.typecode == self.values.typecode == "q"
+            storage = array("q" if is_int else "d", other.storage)
+            for i in range(self.rows):
+                offset = i * self.cols
+                for j, x in self.row_items(i):
+                    storage[offset + j] += x
+            return Matrix.from_storage(storage, self.rows, self.cols)
+        if isinstance(other, MatrixNumpy):
+            self._check_shape(other)
+            dtype = np.result_type(other.data, np.asarray(self.values))
+            dense = other.data.astype(dtype)
+            dense[self._row_indices_np(), np.asarray(self.indices)] += self.values
+            return MatrixNumpy(dense)
+        return NotImplemented
+
+    __radd__ = __add__
+
+    def __mul__(self, other) -> "SparseMatrix":
+        """Element-wise product is nonzero only where self is, so always sparse"""
+        if isinstance(other, Number):
+            row_dicts = [
+                {j: x * other for j, x in self.row_items(i)} for i in range(self.rows)
+            ]
+            return SparseMatrix._from_row_dicts(row_dicts, self.rows, self.cols)
+        if isinstance(other, SparseMatrix):
+            self._check_shape(other)
+            row_dicts = []
+            for i in range(self.rows):
+                other_row = dict(other.row_items(i))
+                row_dicts.append(
+                    {
+                        j: x * other_row[j]
+                        for j, x in self.row_items(i)
+                        if j in other_row
+                    }
+                )
+            return SparseMatrix._from_row_dicts(row_dicts, self.rows, self.cols)
+        if isinstance(other, Matrix):
+            self._check_shape(other)
+            row_dicts = [
+                {j: x * other[i, j] for j, x in self.row_items(i)}
+                for i in range(self.rows)
+            ]
+            return SparseMatrix._from_row_dicts(row_dicts, self.rows, self.cols)
+        if isinstance(other, MatrixNumpy):
+            self._check_shape(other)
+            products = other.data[self._row_indices_np(), np.asarray(self.indices)]
+            products = products * np.asarray(self.values)
+            return SparseMatrix.from_coo(
+                self._row_indices_np().tolist(),
+                self.indices,
+                products.tolist(),
+                self.rows,
+                self.cols,
+            )
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def __matmul__(self, other) -> Union["SparseMatrix", DenseMatrix]:
+        """
+        Sparse @ sparse: row by row (Gustavson), O(sum of flops), sparse result.
+        Sparse @ dense: each nonzero adds a scaled row of other, dense result.
+        """
+        if not isinstance(other, (SparseMatrix, Matrix, MatrixNumpy)):
+            return NotImplemented
+        if self.cols != other.rows:
+            raise ValueError("Invalid dimensions for matrix multiplication")
+
+        if isinstance(other, SparseMatrix):
+            row_dicts = []
+            for i in range(self.rows):
+                row: Dict[int, float] = {}
+                for k, a in self.row_items(i):
+                    for j, b in other.row_items(k):
+                        row[j] = row.get(j, 0) + a * b
+                row_dicts.append(row)
+            return SparseMatrix._from_row_dicts(row_dicts, self.rows, other.cols)
+
+        if isinstance(other, Matrix):
+            is_int = other.typecode == self.values.typecode == "q"
+            result = []
+            for i in range(self.rows):
+                row = [0 if is_int else 0.0] * other.cols
+                for k, a in self.row_items(i):
+                    scaled = map(operator.mul, repeat(a), other.row(k))
+                    row = list(map(operator.add, row, scaled))
+                result.extend(row)
+            return Matrix.from_storage(make_storage(result), self.rows, other.cols)
+
+        result = np.zeros(
+            (self.rows, other.cols),
+            dtype=np.result_type(np.asarray(self.values), other.data),
+        )
+        np.add.at(
+            result,
+            self._row_indices_np(),
+            other.data[np.asarray(self.indices)] * np.asarray(self.values)[:, None],
+        )
+        return MatrixNumpy(result)
+
+    def __rmatmul__(self, other) -> DenseMatrix:
+        """
+        Dense @ sparse, dense result.
+        Matrix: row i of result sums rows k of self scaled by other[i, k].
+        MatrixNumpy: column j of result sums scaled columns of other.
+        """
+        if not isinstance(other, (Matrix, MatrixNumpy)):
+            return NotImplemented
+        if other.cols != self.rows:
+            raise ValueError("Invalid dimensions for matrix multiplication")
+
+        if isinstance(other, Matrix):
+            is_int = other.typecode == self.values.typecode == "q"
+            result = []
+            for i in range(other.rows):
+                row = [0 if is_int else 0.0] * self.cols
+                for k, a in enumerate(other.row(i)):
+                    if a:
+                        for j, x in self.row_items(k):
+                            row[j] += a * x
+                result.extend(row)
+            return Matrix.from_storage(make_storage(result), other.rows, self.cols)
+
+        result = np.zeros(
+            (other.rows, self.cols),
+            dtype=np.result_type(np.asarray(self.values), other.data),
+        )
+        np.add.at(
+            result.T,
+            np.asarray(self.indices),
+            (other.data[:, self._row_indices_np()] * np.asarray(self.values)).T,
+        )
+        return MatrixNumpy(result)
+
+    def save_binary(self, fpath: Path):
+        """Binary format is dense: save elements of to_matrix()"""
+        self.to_matrix().save_binary(fpath)
+
+    def content_digest(self) -> bytes:
+        """
+        blake2b over shape and CSR arrays, O(rows + nnz).
+        Values are hashed as floats, so equal int and float matrices match.
+        """
+        if self._digest is None:
+            header = f"{self.rows}x{self.cols}".encode()
+            digest = hashlib.blake2b(header, digest_size=32)
+            digest.update(self.indptr)
+            digest.update(self.indices)
+            digest.update(array("d", self.values))
+            self._digest = digest.digest()
+        return self._digest
+
+    def __hash__(self) -> int:
+        return int.from_bytes(self.content_digest()[:8], "little", signed=True)
+
+    def __eq__(self, other) -> bool:
+        """Equal elements, compared densely row by row against dense matrices"""
+        if isinstance(other, (Matrix, MatrixNumpy)):
+            return (self.rows, self.cols) == (other.rows, other.cols) and all(
+                self.dense_row(i) == list(dense_row)
+                for i, dense_row in enumerate(other.data)
+            )
+        if not isinstance(other, SparseMatrix):
+            return False
+        return (
+            (self.rows, self.cols) == (other.rows, other.cols)
+            and self.indptr == other.indptr
+            and self.indices == other.indices
+            and self.values == other.values
+        )
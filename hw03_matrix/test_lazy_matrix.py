@@ -0,0 +1,31 @@
+import pytest
+
+from matrix import Matrix
+
+
+def test_lazy_equals_matrix_both_ways():
+    a = Matrix([[1, 2], [3, 4]])
+    b = Matrix([[5, 6], [7, 8]])
+    assert a == a.lazy()
+    assert a.lazy() == a
+    assert (a.lazy() + b) * a == (a + b) * a
+    assert a @ b == a.lazy() @ b
+    assert a.lazy() != b
+    assert b != a.lazy()
+
+
+def test_lazy_equals_lazy():
+    a = Matrix([[1, 2], [3, 4]])
+    assert a.lazy() + a == a.lazy() * Matrix([[2, 2], [2, 2]])
+    assert a.lazy() != a.lazy() + a
+
+
+def test_different_shapes_are_not_equal():
+    a = Matrix([[1, 2], [3, 4]])
+    assert a.lazy() != Matrix([[1, 2]])
+    assert a.lazy() != "a"
+
+
+def test_lazy_matrix_is_unhashable():
+    with pytest.raises(TypeError):
+        hash(Matrix([[1]]).lazy())
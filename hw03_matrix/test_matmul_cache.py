@@ -0,0 +1,43 @@
+import math
+
+import pytest
+
+from matrix import Matrix
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    Matrix.clear_cache()
+    yield
+    Matrix.clear_cache()
+
+
+def test_writes_to_product_do_not_change_cached_one():
+    a = Matrix([[1, 2], [3, 4]])
+    b = Matrix([[5, 6], [7, 8]])
+    product = a @ b
+    product[0, 0] = 999
+    product[0, 1] = 0.5
+    hits = Matrix.matmul_cache.stats().hits
+    assert (a @ b).tolist() == [[19, 22], [43, 50]]
+    assert Matrix.matmul_cache.stats().hits == hits + 1
+
+
+def test_changed_operand_is_not_served_from_cache():
+    a = Matrix([[1, 2], [3, 4]])
+    b = Matrix([[5, 6], [7, 8]])
+    a @ b
+    a[0, 0] = 2
+    assert (a @ b)[0, 0] == 24
+    assert (Matrix([[1, 2], [3, 4]]) @ b)[0, 0] == 19
+
+
+def test_nan_operands_hit():
+    a = Matrix([[1.5, math.nan]])
+    b = Matrix([[1.0], [2.0]])
+    a @ b
+    before = Matrix.matmul_cache.stats()
+    assert math.isnan((a @ b)[0, 0])
+    after = Matrix.matmul_cache.stats()
+    assert after.hits == before.hits + 1
+    assert after.collisions == before.collisions
@@ -0,0 +1,96 @@
+import gc
+import math
+import random
+
+import pytest
+
+import out_of_core
+from matrix import Matrix
+from out_of_core import DiskMatrix, add, matmul, mul
+
+
+def random_matrix(rng: random.Random, rows: int, cols: int, is_int: bool) -> Matrix:
+    element = (lambda: rng.randint(-9, 9)) if is_int else rng.random
+    return Matrix([[element() for _ in range(cols)] for _ in range(rows)])
+
+
+def assert_matches(actual: Matrix, expected: Matrix, is_int: bool):
+    if is_int:
+        assert actual == expected
+    else:
+        assert all(
+            math.isclose(x, y, rel_tol=1e-9, abs_tol=1e-12)
+            for x, y in zip(actual.storage, expected.storage)
+        )
+
+
+@pytest.mark.parametrize("case", range(20))
+def test_matches_in_memory_matrix(tmp_path, case):
+    rng = random.Random(case)
+    n, k, m = (rng.randint(1, 40) for _ in range(3))
+    is_int = case % 2 == 0
+    a, b = random_matrix(rng, n, k, is_int), random_matrix(rng, n, k, is_int)
+    c = random_matrix(rng, k, m, is_int)
+    # Budget of a few hundred bytes forces tiles of a few elements
+    budget = rng.randint(100, 2000)
+    with (
+        DiskMatrix.from_matrix(a, tmp_path / "a.bin") as disk_a,
+        DiskMatrix.from_matrix(b, tmp_path / "b.bin") as disk_b,
+        DiskMatrix.from_matrix(c, tmp_path / "c.bin") as disk_c,
+    ):
+        results = [
+            (add(disk_a, disk_b, tmp_path / "add.bin", budget), a + b),
+            (mul(disk_a, disk_b, tmp_path / "mul.bin", budget), a * b),
+            (matmul(disk_a, disk_c, tmp_path / "matmul.bin", budget), a @ c),
+        ]
+        for disk_result, expected in results:
+            with disk_result:
+                assert_matches(disk_result.to_matrix(), expected, is_int)
+
+
+@pytest.fixture
+def operands(tmp_path):
+    a = Matrix([[1, 2], [3, 4]])
+    with (
+        DiskMatrix.from_matrix(a, tmp_path / "a.bin") as disk_a,
+        DiskMatrix.from_matrix(a, tmp_path / "b.bin") as disk_b,
+    ):
+        yield a, disk_a, disk_b
+
+
+def files(tmp_path) -> set:
+    return {path.name for path in tmp_path.iterdir()}
+
+
+def test_operator_result_removed_on_close(tmp_path, operands):
+    a, disk_a, disk_b = operands
+    with disk_a @ disk_b as product:
+        assert product.fpath.exists()
+        assert product.to_matrix() == a @ a
+    assert files(tmp_path) == {"a.bin", "b.bin"}
+
+
+def test_operator_result_removed_when_dropped(tmp_path, operands):
+    a, disk_a, disk_b = operands
+    assert ((disk_a + disk_b) * disk_b).to_matrix() == (a + a) * a
+    gc.collect()
+    assert files(tmp_path) == {"a.bin", "b.bin"}
+
+
+def test_failed_operator_leaves_no_file(tmp_path, operands, monkeypatch):
+    _, disk_a, disk_b = operands
+
+    def fail(*args):
+        raise RuntimeError("tile failed")
+
+    monkeypatch.setattr(out_of_core, "_write_result", fail)
+    with pytest.raises(RuntimeError):
+        disk_a + disk_b
+    assert files(tmp_path) == {"a.bin", "b.bin"}
+
+
+def test_explicit_output_file_is_kept(tmp_path, operands):
+    a, disk_a, disk_b = operands
+    add(disk_a, disk_b, tmp_path / "sum.bin").close()
+    with DiskMatrix(tmp_path / "sum.bin") as total:
+        assert total.to_matrix() == a + a
@@ -0,0 +1,14 @@
+from matrix import Matrix
+from sparse_matrix import SparseMatrix
+
+
+def test_int_sparse_matmul_float_dense():
+    product = SparseMatrix([[2, 0], [0, 3]]) @ Matrix([[1.5, 0.5], [1.0, 2.0]])
+    assert product == Matrix([[3.0, 1.0], [3.0, 6.0]])
+    assert product.typecode == "d"
+
+
+def test_empty_sparse_row_keeps_float_result():
+    product = SparseMatrix([[0, 0], [1, 0]]) @ Matrix([[1.5], [2.5]])
+    assert product.tolist() == [[0.0], [1.5]]
+    assert product.typecode == "d"
@@ -1,31 +1,123 @@
+import json
+import math
 import multiprocessing
+import platform
+import statistics
+import sys
 import threading
 import time
+from functools import lru_cache
+from multiprocessing.pool import ThreadPool
 from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Tuple
+
+# fib_many reaches n from the previous request by additions if it's this close
+STEP_LIMIT = 64
 
 
 def fib(n: int) -> int:
+    """Naive exponential recursion, CPU-burn workload for the comparison"""
     if n <= 1:
         return n
     return fib(n - 1) + fib(n - 2)
 
 
-def run_synchronous(n: int, times: int) -> float:
+def _double(a: int, b: int, odd: int) -> Tuple[int, int]:
+    """(F(k), F(k+1)) -> (F(2k + odd), F(2k + odd + 1))"""
+    c = a * (2 * b - a)  # F(2k)
+    d = a * a + b * b  # F(2k+1)
+    return (d, c + d) if odd else (c, d)
+
+
+def fib_fast(n: int) -> int:
+    """Fast doubling over bits of n: O(log n) big int multiplications"""
+    if n < 0:
+        raise ValueError("n must be non-negative")
+    a, b = 0, 1
+    for bit in bin(n)[2:]:
+        a, b = _double(a, b, bit == "1")
+    return a
+
+
+@lru_cache(maxsize=4096)
+def _fib_pair(n: int) -> Tuple[int, int]:
+    if n == 0:
+        return 0, 1
+    return _double(*_fib_pair(n >> 1), n & 1)
+
+
+def fib_memo(n: int) -> int:
+    """Fast doubling with memoized (F(k), F(k+1)) shared between calls"""
+    if n < 0:
+        raise ValueError("n must be non-negative")
+    return _fib_pair(n)[0]
+
+
+def _pair_with_memo(n: int, memo: Dict[int, Tuple[int, int]]) -> Tuple[int, int]:
+    # Halving chain n, n >> 1, ... down to a known pair, then double back up
+    chain = []
+    while n not in memo:
+        chain.append(n)
+        n >>= 1
+    pair = memo[n]
+    for k in reversed(chain):
+        pair = memo[k] = _double(*pair, k & 1)
+    return pair
+
+
+def fib_many(ns: Iterable[int]) -> List[int]:
+    """
+    Fibonacci numbers for all ns, in the same order.
+    Requests are served in increasing order and built from the previous one:
+    by a few additions if it's close, by the addition formula
+    F(k+g) = F(k+1)F(g) + F(k)F(g-1) if the gap g is smaller than k
+    (products with the small F(g) are cheap), else by fast doubling.
+    Halving chains of all doublings are shared through a memo.
+    """
+    ns = list(ns)
+    if any(n < 0 for n in ns):
+        raise ValueError("n must be non-negative")
+    memo: Dict[int, Tuple[int, int]] = {0: (0, 1)}
+    results: Dict[int, int] = {}
+    last_n, a, b = None, 0, 1
+    for n in sorted(set(ns)):
+        gap = n - last_n if last_n is not None else n
+        if last_n is not None and gap <= STEP_LIMIT:
+            for _ in range(gap):
+                a, b = b, a + b
+        elif last_n is not None and gap < last_n:
+            g0, g1 = _pair_with_memo(gap, memo)
+            a, b = b * g0 + a * (g1 - g0), b * g1 + a * g0
+        else:
+            a, b = _pair_with_memo(n, memo)
+        results[n] = a
+        last_n = n
+    return [results[n] for n in ns]
+
+
+WORKLOADS: Dict[str, Callable[[int], int]] = {
+    "naive": fib,
+    "fast": fib_fast,
+    "memo": fib_memo,
+}
+
+
+def run_synchronous(n: int, times: int, workload: Callable = fib) -> float:
     start_time = time.time()
 
     for i in range(times):
-        fib_res = fib(n)
+        fib_res = workload(n)
 
     end_time = time.time()
     return end_time - start_time
 
 
-def run_threaded(n: int, times: int) -> float:
+def run_threaded(n: int, times: int, workload: Callable = fib) -> float:
     threads = []
     start_time = time.time()
 
     for i in range(times):
-        thread = threading.Thread(target=fib, args=(n,))
+        thread = threading.Thread(target=workload, args=(n,))
         threads.append(thread)
         thread.start()
 
@@ -36,12 +128,12 @@ def run_threaded(n: int, times: int) -> float:
     return end_time - start_time
 
 
-def run_multiprocess(n: int, times: int) -> float:
+def run_multiprocess(n: int, times: int, workload: Callable = fib) -> float:
     processes = []
     start_time = time.time()
 
     for i in range(times):
-        process = multiprocessing.Process(target=fib, args=(n,))
+        process = multiprocessing.Process(target=workload, args=(n,))
         processes.append(process)
         process.start()
 
@@ -52,6 +144,117 @@ def run_multiprocess(n: int, times: int) -> float:
     return end_time - start_time
 
 
+def available_pool_kinds() -> List[str]:
+    """Pool kinds of this interpreter: threads, process start methods, interpreters"""
+    kinds = ["thread"] + multiprocessing.get_all_start_methods()
+    try:
+        from concurrent.futures import InterpreterPoolExecutor  # noqa: F401
+
+        kinds.append("interpreter")  # Python 3.14+
+    except ImportError:
+        pass
+    return kinds
+
+
+def make_pool(kind: str, workers: int):
+    """Reusable pool with .map(func, items); all of them are context managers"""
+    if kind == "thread":
+        return ThreadPool(workers)
+    if kind == "interpreter":
+        from concurrent.futures import InterpreterPoolExecutor
+
+        return InterpreterPoolExecutor(workers)
+    return multiprocessing.get_context(kind).Pool(workers)
+
+
+def is_gil_enabled() -> bool:
+    """False on free-threaded builds (3.13t+) running without the GIL"""
+    return getattr(sys, "_is_gil_enabled", lambda: True)()
+
+
+def summarize(times: List[float]) -> Dict[str, float]:
+    """
+    Median with 95% confidence interval from order statistics
+    (ranks n/2 -+ 1.96 sqrt(n)/2), p95, mean and spread of run times
+    """
+    times = sorted(times)
+    count = len(times)
+    half_width = 1.96 * math.sqrt(count) / 2
+    low = max(0, math.floor(count / 2 - half_width))
+    high = min(count - 1, math.ceil(count / 2 + half_width) - 1)
+    return {
+        "median": statistics.median(times),
+        "ci95_low": times[low],
+        "ci95_high": times[high],
+        "p95": times[min(count - 1, math.ceil(0.95 * count) - 1)],
+        "mean": statistics.fmean(times),
+        "stdev": statistics.stdev(times) if count > 1 else 0.0,
+        "min": times[0],
+        "runs": count,
+    }
+
+
+def measure_runs(run: Callable[[], list], expected: list, warmup: int, repeats: int):
+    """Warm up, then time repeated runs with perf_counter, checking results"""
+    for _ in range(warmup):
+        run()
+    times = []
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        results = run()
+        times.append(time.perf_counter() - start_time)
+        if results != expected:
+            raise RuntimeError("Workload returned wrong results")
+    return summarize(times)
+
+
+def benchmark_pools(
+    n: int,
+    times: int,
+    workload: Callable,
+    kinds: List[str],
+    max_workers: int,
+    warmup: int = 1,
+    repeats: int = 10,
+) -> List[Dict]:
+    """
+    Scaling curves: for every pool kind and worker count, one pool is created
+    and reused for warmup and all timed runs of `times` tasks.
+    Pool startup is excluded from the timings.
+    """
+    expected = [workload(n)] * times
+    rows = [
+        {
+            "kind": "synchronous",
+            "workers": 1,
+            **measure_runs(
+                lambda: [workload(n) for _ in range(times)], expected, warmup, repeats
+            ),
+        }
+    ]
+    print(f"synchronous: median {rows[0]['median']:.4f}s")
+    for kind in kinds:
+        for workers in range(1, max_workers + 1):
+            try:
+                with make_pool(kind, workers) as pool:
+                    stats = measure_runs(
+                        lambda: list(pool.map(workload, [n] * times)),
+                        expected,
+                        warmup,
+                        repeats,
+                    )
+            except Exception as e:  # e.g. workload not shareable with interpreters
+                print(f"{kind}: skipped ({type(e).__name__}: {e})")
+                break
+            rows.append({"kind": kind, "workers": workers, **stats})
+            print(
+                f"{kind:<12} workers={workers:<3} median {stats['median']:.4f}s "
+                f"[{stats['ci95_low']:.4f}, {stats['ci95_high']:.4f}] "
+                f"p95 {stats['p95']:.4f}s"
+            )
+    return rows
+
+
 def main():
     import argparse
 
@@ -62,14 +265,65 @@ def main():
     parser.add_argument(
         "--times", type=int, default=10, help="Number of parallel executions"
     )
+    parser.add_argument(
+        "--workload",
+        choices=list(WORKLOADS),
+        default="naive",
+        help="Fibonacci implementation, naive one burns CPU for the comparison",
+    )
+    parser.add_argument(
+        "--pools",
+        action="store_true",
+        help="Benchmark reusable pools over worker counts instead, write JSON",
+    )
+    parser.add_argument(
+        "--kinds",
+        nargs="+",
+        choices=available_pool_kinds(),
+        default=available_pool_kinds(),
+        help="Pool kinds for --pools",
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=multiprocessing.cpu_count() * 2,
+        help="Largest pool size for --pools",
+    )
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed runs")
+    parser.add_argument("--repeats", type=int, default=10, help="Timed runs")
     args = parser.parse_args()
 
     n = args.n
     times = args.times
+    workload = WORKLOADS[args.workload]
+
+    if args.pools:
+        rows = benchmark_pools(
+            n, times, workload, args.kinds, args.max_workers, args.warmup, args.repeats
+        )
+        report = {
+            "meta": {
+                "n": n,
+                "tasks": times,
+                "workload": args.workload,
+                "warmup": args.warmup,
+                "repeats": args.repeats,
+                "python": platform.python_version(),
+                "gil_enabled": is_gil_enabled(),
+                "cpu_count": multiprocessing.cpu_count(),
+            },
+            "results": rows,
+        }
+        artifacts_dir = Path("artifacts") / "01_fib"
+        artifacts_dir.mkdir(parents=True, exist_ok=True)
+        report_file = artifacts_dir / "pools_benchmark.json"
+        report_file.write_text(json.dumps(report, indent=2))
+        print(f"Saved to {report_file}")
+        return
 
-    time_sync = run_synchronous(n, times)
-    time_thread = run_threaded(n, times)
-    time_process = run_multiprocess(n, times)
+    time_sync = run_synchronous(n, times, workload)
+    time_thread = run_threaded(n, times, workload)
+    time_process = run_multiprocess(n, times, workload)
 
     artifacts_dir = Path("artifacts") / "01_fib"
     artifacts_dir.mkdir(exist_ok=True)
@@ -1,13 +1,16 @@
+import atexit
 import concurrent.futures
 import math
+import statistics
+import struct
 import time
-from functools import partial
-from multiprocessing import cpu_count
-from operator import itemgetter
+from functools import lru_cache, partial
+from multiprocessing import cpu_count, shared_memory
 from pathlib import Path
-from typing import Any, Callable, Dict, List
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
 
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 
 
@@ -24,53 +27,686 @@ def partial_integrate(
     return acc
 
 
+# math functions and their ufunc counterparts for the numpy backend
+UFUNCS: Dict[Callable, np.ufunc] = {
+    math.cos: np.cos,
+    math.sin: np.sin,
+    math.tan: np.tan,
+    math.exp: np.exp,
+    math.log: np.log,
+    math.sqrt: np.sqrt,
+    math.atan: np.arctan,
+    math.cosh: np.cosh,
+    math.sinh: np.sinh,
+    math.tanh: np.tanh,
+    math.fabs: np.fabs,
+}
+BLOCK_SIZE = 1 << 16  # points per block: two float64 buffers of 512 KiB
+
+
+def to_ufunc(f: Callable) -> np.ufunc:
+    """ufunc for f: f itself if it is one, numpy version of math functions"""
+    if isinstance(f, np.ufunc):
+        return f
+    if f in UFUNCS:
+        return UFUNCS[f]
+    raise ValueError(f"No vectorized version of {f}, pass a numpy ufunc")
+
+
+def partial_integrate_numpy(
+    start_idx: int,
+    end_idx: int,
+    f: Callable[[float], float],
+    a: float,
+    step: float,
+    block_size: int = BLOCK_SIZE,
+) -> float:
+    """
+    Same sum as partial_integrate, evaluated by ufunc over blocks of points.
+    Two block-sized buffers are reused, so memory doesn't depend on n_iter.
+    Blocks are summed pairwise by np.sum, block sums exactly by math.fsum.
+    numpy releases the GIL inside, so threads run blocks in parallel.
+    """
+    ufunc = to_ufunc(f)
+    offsets = np.arange(block_size) * step  # j * step, shared by all blocks
+    x = np.empty(block_size)
+    block_sums = []
+    for block_start in range(start_idx, end_idx, block_size):
+        size = min(block_size, end_idx - block_start)
+        points = x[:size]
+        np.add(offsets[:size], a + block_start * step, out=points)
+        ufunc(points, out=points)
+        block_sums.append(float(np.sum(points)))
+    return math.fsum(block_sums) * step
+
+
+BACKENDS = {"python": partial_integrate, "numpy": partial_integrate_numpy}
+
+# Integrands by name: integrate_processes workers resolve them by name
+INTEGRANDS: Dict[str, Callable[[float], float]] = {
+    "cos": math.cos,
+    "sin": math.sin,
+    "exp": math.exp,
+    "log": math.log,
+    "sqrt": math.sqrt,
+}
+# Names usable in string integrands like "exp(-x) * sin(x) ** 2"
+EXPRESSION_NAMESPACE: Dict[str, Any] = {
+    name: getattr(math, name) for name in dir(math) if not name.startswith("_")
+}
+EXPRESSION_NAMESPACE.update(abs=abs, min=min, max=max, __builtins__={})
+
+Integrand = Union[str, Callable[[float], float]]
+
+
+def register_integrand(name: str, f: Callable[[float], float]):
+    """
+    Make f available by name. Forked workers see all registrations,
+    spawned ones only those made at import of this module.
+    """
+    INTEGRANDS[name] = f
+    return f
+
+
+@lru_cache(maxsize=128)
+def compile_expression(expression: str) -> Callable[[float], float]:
+    """Function of x from expression over math names, compiled once"""
+    code = compile(f"lambda x: ({expression})", "<integrand>", "eval")
+    return eval(code, dict(EXPRESSION_NAMESPACE))
+
+
+def resolve_integrand(f: Integrand) -> Callable[[float], float]:
+    """Callable as is, registered name, else expression of x"""
+    if callable(f):
+        return f
+    if f in INTEGRANDS:
+        return INTEGRANDS[f]
+    return compile_expression(f)
+
+
 def integrate(
     f: Callable[[float], float],
     a: float,
     b: float,
     n_iter: int = 10000000,
+    backend: str = "python",
 ) -> float:
     step = (b - a) / n_iter
     start_idx = 0
     end_idx = n_iter
-    return partial_integrate(start_idx, end_idx, f, a, step)
+    return BACKENDS[backend](start_idx, end_idx, resolve_integrand(f), a, step)
+
+
+SCHEDULES = ("static", "dynamic", "guided")
+CHUNKS_PER_JOB = 16  # dynamic: chunks per worker when chunk_size is not given
+
+_executors: Dict[Tuple[Any, int], concurrent.futures.Executor] = {}
+
+
+def get_executor(executor_class: Any, n_jobs: int) -> concurrent.futures.Executor:
+    """Persistent pool per executor class and number of workers"""
+    key = (executor_class, n_jobs)
+    if key not in _executors:
+        _executors[key] = executor_class(max_workers=n_jobs)
+    return _executors[key]
+
+
+@atexit.register
+def shutdown_executors():
+    for executor in _executors.values():
+        executor.shutdown()
+    _executors.clear()
+
+
+def make_chunks(
+    n_iter: int,
+    n_jobs: int,
+    schedule: str = "static",
+    chunk_size: Optional[int] = None,
+) -> List[Tuple[int, int]]:
+    """
+    (start_idx, end_idx) of chunks in order, depending only on the arguments.
+    static: n_jobs equal chunks, the last one takes the remainder
+    dynamic: chunks of chunk_size (default n_iter / (n_jobs * CHUNKS_PER_JOB))
+    guided: remaining / (2 * n_jobs) but at least chunk_size, so chunks
+        shrink to the end and late stragglers are small
+    """
+    if schedule == "static":
+        size = n_iter // n_jobs
+        return [
+            (i * size, (i + 1) * size if i < n_jobs - 1 else n_iter)
+            for i in range(n_jobs)
+        ]
+    if schedule == "dynamic":
+        size = chunk_size or max(1, n_iter // (n_jobs * CHUNKS_PER_JOB))
+        return [(i, min(i + size, n_iter)) for i in range(0, n_iter, size)]
+    if schedule == "guided":
+        min_size = chunk_size or max(1, n_iter // (n_jobs * CHUNKS_PER_JOB * 4))
+        chunks = []
+        start = 0
+        while start < n_iter:
+            size = max(min_size, math.ceil((n_iter - start) / (2 * n_jobs)))
+            chunks.append((start, min(start + size, n_iter)))
+            start += size
+        return chunks
+    raise ValueError(f"Unknown schedule: {schedule}, expected one of {SCHEDULES}")
+
+
+def _integrate_chunk(
+    start_idx: int, end_idx: int, f: Integrand, a: float, step: float, backend: str
+) -> float:
+    """Task of integrate_parallel, f is resolved in the worker"""
+    return BACKENDS[backend](start_idx, end_idx, resolve_integrand(f), a, step)
 
 
 def integrate_parallel(
-    f: Callable[[float], float],
+    f: Integrand,
     a: float,
     b: float,
     n_jobs: int = 1,
     n_iter: int = 10000000,
     executor_class: Any = concurrent.futures.ThreadPoolExecutor,
+    backend: str = "python",
+    schedule: str = "static",
+    chunk_size: Optional[int] = None,
+    reuse_pool: bool = False,
 ) -> float:
+    """
+    Chunks of make_chunks are queued to the executor at once and idle
+    workers take the next one, so with dynamic or guided schedules a slow
+    part of the domain is shared out instead of holding up one worker.
+    Chunk sums come back in chunk order, so the result is reproducible
+    whichever worker computed what. f and a are pickled into every task of
+    a process pool: names and expressions go as strings and are resolved in
+    the worker (an expression is compiled once per worker), callables must
+    be picklable, see integrate_processes for closures.
+
+    reuse_pool: Take persistent executor of get_executor instead of
+        starting a new one for this call
+    """
 
     if n_jobs == 1:
-        return integrate(f, a, b, n_iter=n_iter)
+        return integrate(f, a, b, n_iter=n_iter, backend=backend)
 
     step = (b - a) / n_iter
-    chunk_size = n_iter // n_jobs
-
-    # Prepare chunks for parallel processing
-    chunks: List[Dict[str, Any]] = []
-    partial_integrate_func = partial(partial_integrate, f=f, a=a, step=step)
-    for i in range(n_jobs):
-        start_idx = i * chunk_size
-        end_idx = start_idx + chunk_size if i < n_jobs - 1 else n_iter
-        chunks.append(dict(start_idx=start_idx, end_idx=end_idx))
+    chunks = make_chunks(n_iter, n_jobs, schedule, chunk_size)
+    starts, ends = zip(*chunks)
+    resolve_integrand(f)  # bad expression fails here, not in every task
+    partial_integrate_func = partial(
+        _integrate_chunk, f=f, a=a, step=step, backend=backend
+    )
 
     # Execute in parallel
-    with executor_class(max_workers=n_jobs) as executor:
-        results = executor.map(
-            partial_integrate_func,
-            map(itemgetter("start_idx"), chunks),
-            map(itemgetter("end_idx"), chunks),
-        )
+    if reuse_pool:
+        executor = get_executor(executor_class, n_jobs)
+        results = list(executor.map(partial_integrate_func, starts, ends))
+    else:
+        with executor_class(max_workers=n_jobs) as executor:
+            results = list(executor.map(partial_integrate_func, starts, ends))
+
+    return math.fsum(results) if backend == "numpy" else sum(results)
+
+
+# State of integrate_processes worker, set once by _init_worker
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(f: Integrand, a: float, step: float, backend: str, sums_name: str):
+    _worker["partial_integrate"] = partial(
+        BACKENDS[backend], f=resolve_integrand(f), a=a, step=step
+    )
+    # Owner unlinks the block, attach registration is dropped with it
+    _worker["sums"] = shared_memory.SharedMemory(name=sums_name)
+
+
+def _integrate_chunk_shared(index: int, start_idx: int, end_idx: int):
+    value = _worker["partial_integrate"](start_idx, end_idx)
+    struct.pack_into("d", _worker["sums"].buf, index * 8, value)
+
+
+def integrate_processes(
+    f: Integrand,
+    a: float,
+    b: float,
+    n_jobs: int = 0,
+    n_iter: int = 10000000,
+    backend: str = "python",
+    schedule: str = "static",
+    chunk_size: Optional[int] = None,
+    mp_context: Any = None,
+) -> float:
+    """
+    Process pool integration where tasks carry only chunk indices.
+    f, a and step reach every worker once through the initializer, there
+    f is resolved: registered name, expression compiled once per worker,
+    or callable (closures and lambdas work with fork start method).
+    Chunk sums are written to shared memory instead of pickled back,
+    and added up in chunk order like in integrate_parallel.
+    """
+    n_jobs = n_jobs or cpu_count()
+    step = (b - a) / n_iter
+    chunks = make_chunks(n_iter, n_jobs, schedule, chunk_size)
+    starts, ends = zip(*chunks)
+
+    sums_block = shared_memory.SharedMemory(create=True, size=8 * len(chunks))
+    try:
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=n_jobs,
+            mp_context=mp_context,
+            initializer=_init_worker,
+            initargs=(f, a, step, backend, sums_block.name),
+        ) as executor:
+            tasks = executor.map(
+                _integrate_chunk_shared, range(len(chunks)), starts, ends
+            )
+            # Results are None, iterating just waits and raises errors of tasks
+            for _ in tasks:
+                pass
+        sums = struct.unpack_from(f"{len(chunks)}d", sums_block.buf)
+    finally:
+        sums_block.close()
+        sums_block.unlink()
+
+    return math.fsum(sums) if backend == "numpy" else sum(sums)
+
+
+# 15-point Gauss-Kronrod rule (QUADPACK qk15): nodes on [-1, 1], the odd ones
+# and the center are the 7-point Gauss nodes with weights GAUSS_WEIGHTS
+KRONROD_NODES = (
+    0.991455371120812639206854697526329,
+    0.949107912342758524526189684047851,
+    0.864864423359769072789712788640926,
+    0.741531185599394439863864773280788,
+    0.586087235467691130294144845693013,
+    0.405845151377397166906606412076961,
+    0.207784955007898467600689403773245,
+)
+KRONROD_WEIGHTS = (
+    0.022935322010529224963732008058970,
+    0.063092092629978553290700663189204,
+    0.104790010322250183839876322541518,
+    0.140653259715525918745189590510238,
+    0.169004726639267902826583426598550,
+    0.190350578064785409913256402421014,
+    0.204432940075298892414161999234649,
+)
+KRONROD_CENTER_WEIGHT = 0.209482141084727828012999174891714
+GAUSS_WEIGHTS = (
+    0.129484966168869693270611432679082,
+    0.279705391489276667901467771423780,
+    0.381830050505118944950369775488975,
+)
+GAUSS_CENTER_WEIGHT = 0.417959183673469387755102040816327
+EVALS_PER_INTERVAL = 15
+
+Interval = Tuple[float, float]
+
+
+class AdaptiveResult(NamedTuple):
+    value: float
+    error: float  # estimate of absolute error
+    n_evals: int  # function evaluations
+    n_intervals: int
+
+
+def gauss_kronrod(f: Callable[[float], float], lo: float, hi: float):
+    """Integral over [lo, hi] by K15 and its error estimate |K15 - G7|"""
+    center = (lo + hi) / 2
+    half = (hi - lo) / 2
+    f_center = f(center)
+    kronrod = KRONROD_CENTER_WEIGHT * f_center
+    gauss = GAUSS_CENTER_WEIGHT * f_center
+    for j, node in enumerate(KRONROD_NODES):
+        pair = f(center - half * node) + f(center + half * node)
+        kronrod += KRONROD_WEIGHTS[j] * pair
+        if j % 2 == 1:
+            gauss += GAUSS_WEIGHTS[j // 2] * pair
+    return kronrod * half, abs(kronrod - gauss) * half
+
+
+def gauss_kronrod_batch(
+    f: Callable[[float], float], intervals: List[Interval]
+) -> List[Tuple[float, float]]:
+    """One task of integrate_adaptive: rule on every interval of the batch"""
+    return [gauss_kronrod(f, lo, hi) for lo, hi in intervals]
 
-    return sum(results)
 
+def _batches(items: list, n_batches: int) -> List[list]:
+    size = math.ceil(len(items) / n_batches)
+    return [items[start : start + size] for start in range(0, len(items), size)]
 
-def compare_execution_times(f: Callable[[float], float] = math.cos):
+
+def integrate_adaptive(
+    f: Integrand,
+    a: float,
+    b: float,
+    tol: float = 1e-10,
+    n_jobs: int = 1,
+    executor_class: Any = concurrent.futures.ThreadPoolExecutor,
+    max_intervals: int = 100000,
+) -> AdaptiveResult:
+    """
+    Globally adaptive Gauss-Kronrod quadrature.
+    Every round bisects the intervals whose error estimate is above their
+    share of tol (proportional to length) until the total estimate is <= tol.
+    New intervals of a round are evaluated in n_jobs batches on one executor
+    kept for the whole call. Refinement starts from [a, b] whatever n_jobs is,
+    intervals stay ordered and value is their fsum, so the result doesn't
+    depend on n_jobs or executor.
+    If max_intervals is reached first, error of the result is above tol.
+    f is a callable, registered name or expression of x; it is pickled into
+    every task of a process pool, see integrate_processes for expressions and
+    closures.
+    """
+    f = resolve_integrand(f)
+    length = abs(b - a)
+    executor = executor_class(max_workers=n_jobs) if n_jobs > 1 else None
+    rule = partial(gauss_kronrod_batch, f)
+
+    def evaluate(intervals: List[Interval]) -> List[Tuple[float, float]]:
+        if executor is None:
+            return rule(intervals)
+        batches = executor.map(rule, _batches(intervals, n_jobs))
+        return [result for batch in batches for result in batch]
+
+    try:
+        intervals = [(a, b)]
+        results = evaluate(intervals)
+        n_evals = EVALS_PER_INTERVAL * len(intervals)
+
+        while len(intervals) < max_intervals:
+            total_error = math.fsum(error for _, error in results)
+            if total_error <= tol:
+                break
+            split = [
+                error > tol * abs(hi - lo) / length
+                for (lo, hi), (_, error) in zip(intervals, results)
+            ]
+            halves = []
+            for (lo, hi), is_split in zip(intervals, split):
+                if is_split:
+                    middle = (lo + hi) / 2
+                    halves += [(lo, middle), (middle, hi)]
+            new_results = iter(evaluate(halves))
+            n_evals += EVALS_PER_INTERVAL * len(halves)
+
+            halves_iter = iter(halves)
+            next_intervals, next_results = [], []
+            for interval, result, is_split in zip(intervals, results, split):
+                if is_split:
+                    for _ in range(2):
+                        next_intervals.append(next(halves_iter))
+                        next_results.append(next(new_results))
+                else:
+                    next_intervals.append(interval)
+                    next_results.append(result)
+            intervals, results = next_intervals, next_results
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return AdaptiveResult(
+        value=math.fsum(value for value, _ in results),
+        error=math.fsum(error for _, error in results),
+        n_evals=n_evals,
+        n_intervals=len(intervals),
+    )
+
+
+# Sobol direction numbers (Joe, Kuo: new-joe-kuo-6.21201) for dimensions
+# 2..16 as (degree s, polynomial a, initial m_1..m_s); dimension 1 is all ones
+SOBOL_PARAMS = (
+    (1, 0, (1,)),
+    (2, 1, (1, 3)),
+    (3, 1, (1, 3, 1)),
+    (3, 2, (1, 1, 1)),
+    (4, 1, (1, 1, 3, 3)),
+    (4, 4, (1, 3, 5, 13)),
+    (5, 2, (1, 1, 5, 5, 17)),
+    (5, 4, (1, 1, 5, 5, 5)),
+    (5, 7, (1, 1, 7, 11, 19)),
+    (5, 11, (1, 1, 5, 1, 1)),
+    (5, 13, (1, 1, 1, 3, 11)),
+    (5, 14, (1, 3, 5, 5, 31)),
+    (6, 1, (1, 3, 3, 9, 7, 49)),
+    (6, 13, (1, 1, 1, 15, 21, 21)),
+    (6, 16, (1, 3, 1, 13, 27, 49)),
+)
+SOBOL_BITS = 32
+SAMPLERS = ("mc", "halton", "sobol")
+
+
+@lru_cache(maxsize=None)
+def sobol_directions(dim: int) -> np.ndarray:
+    """Direction numbers V[j, k] of first dim dimensions, shape (dim, SOBOL_BITS)"""
+    if dim > len(SOBOL_PARAMS) + 1:
+        raise ValueError(f"Sobol sequence supports up to {len(SOBOL_PARAMS) + 1} dims")
+    directions = np.zeros((dim, SOBOL_BITS), dtype=np.uint64)
+    for k in range(SOBOL_BITS):
+        directions[0, k] = 1 << (SOBOL_BITS - 1 - k)
+    for j in range(1, dim):
+        degree, poly, m_init = SOBOL_PARAMS[j - 1]
+        m = list(m_init)
+        for k in range(degree, SOBOL_BITS):
+            value = m[k - degree] ^ (m[k - degree] << degree)
+            for i in range(1, degree):
+                if (poly >> (degree - 1 - i)) & 1:
+                    value ^= m[k - i] << i
+            m.append(value)
+        for k in range(SOBOL_BITS):
+            directions[j, k] = m[k] << (SOBOL_BITS - 1 - k)
+    return directions
+
+
+def sobol(start: int, count: int, dim: int, shift: np.ndarray) -> np.ndarray:
+    """
+    Points start..start+count-1 of Sobol sequence in gray code order,
+    digitally shifted by XOR with shift (uint64 per dimension)
+    """
+    index = np.arange(start, start + count, dtype=np.uint64)
+    gray = index ^ (index >> np.uint64(1))
+    directions = sobol_directions(dim)
+    points = np.broadcast_to(shift, (count, dim)).copy()
+    for k in range(SOBOL_BITS):
+        bit = ((gray >> np.uint64(k)) & np.uint64(1)).astype(bool)
+        points[bit] ^= directions[:, k]
+    return points * 2.0**-SOBOL_BITS
+
+
+@lru_cache(maxsize=None)
+def primes(count: int) -> Tuple[int, ...]:
+    found: List[int] = []
+    candidate = 2
+    while len(found) < count:
+        if all(candidate % p for p in found if p * p <= candidate):
+            found.append(candidate)
+        candidate += 1
+    return tuple(found)
+
+
+def halton(start: int, count: int, dim: int, shift: np.ndarray) -> np.ndarray:
+    """
+    Points start..start+count-1 of Halton sequence (radical inverses in
+    prime bases, index 0 skipped), shifted by shift modulo 1
+    """
+    index = np.arange(start + 1, start + count + 1, dtype=np.int64)
+    points = np.empty((count, dim))
+    for j, base in enumerate(primes(dim)):
+        rest = index.copy()
+        scale = 1.0
+        column = np.zeros(count)
+        while rest.any():
+            scale /= base
+            column += scale * (rest % base)
+            rest //= base
+        points[:, j] = column
+    return np.mod(points + shift, 1.0)
+
+
+def unit_points(
+    method: str, dim: int, seed: int, stream: int, batch: int, batch_size: int
+) -> np.ndarray:
+    """
+    Batch of points in unit cube of independent stream.
+    mc: generator seeded by (seed, stream, batch), same whoever computes it
+    halton, sobol: batch-th block of sequence under random shift of stream
+    """
+    if method == "mc":
+        seed_sequence = np.random.SeedSequence(seed, spawn_key=(stream, batch))
+        return np.random.default_rng(seed_sequence).random((batch_size, dim))
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(stream,)))
+    start = batch * batch_size
+    if method == "halton":
+        return halton(start, batch_size, dim, rng.random(dim))
+    if method == "sobol":
+        shift = rng.integers(0, 1 << SOBOL_BITS, dim, dtype=np.uint64)
+        return sobol(start, batch_size, dim, shift)
+    raise ValueError(f"Unknown method: {method}, expected one of {SAMPLERS}")
+
+
+def monte_carlo_batch(
+    stream: int,
+    f: Callable[[np.ndarray], np.ndarray],
+    bounds: np.ndarray,
+    method: str,
+    seed: int,
+    batch: int,
+    batch_size: int,
+) -> Tuple[float, float]:
+    """One task of integrate_monte_carlo: sum and sum of squares of f"""
+    low, high = bounds[:, 0], bounds[:, 1]
+    points = unit_points(method, len(bounds), seed, stream, batch, batch_size)
+    values = f(low + points * (high - low))
+    return float(np.sum(values)), float(np.sum(values * values))
+
+
+class MonteCarloResult(NamedTuple):
+    value: float
+    error: float  # estimate of standard error
+    n_points: int
+    history: List[Tuple[int, float, float]]  # (n_points, value, error) by round
+
+
+def integrate_monte_carlo(
+    f: Callable[[np.ndarray], np.ndarray],
+    bounds: List[Tuple[float, float]],
+    tol: float = 1e-4,
+    method: str = "sobol",
+    n_jobs: int = 1,
+    executor_class: Any = concurrent.futures.ThreadPoolExecutor,
+    n_streams: int = 8,
+    batch_size: int = 1 << 14,
+    max_points: int = 1 << 26,
+    seed: int = 0,
+) -> MonteCarloResult:
+    """
+    Integral of f over box bounds [(low, high), ...] by Monte Carlo or
+    randomized quasi-Monte Carlo. f takes points as (n, dim) array and
+    returns n values; it has to be picklable for process executors.
+
+    Every round adds one batch to each of n_streams independent streams,
+    the batches run in parallel on one executor kept for the whole call.
+    Error estimate: for mc the sample variance over all points, for
+    halton and sobol the spread of stream estimates (each stream is
+    the sequence under its own random shift). Rounds go on until the
+    estimate is <= tol or max_points is reached.
+    Streams depend only on seed, so the result doesn't depend on n_jobs.
+    Sobol batch_size should be a power of 2.
+    """
+    if n_streams < 2:
+        raise ValueError("At least 2 streams are needed for the error estimate")
+    bounds = np.asarray(bounds, dtype=np.float64).reshape(-1, 2)
+    volume = float(np.prod(bounds[:, 1] - bounds[:, 0]))
+    executor = executor_class(max_workers=n_jobs) if n_jobs > 1 else None
+    sums = [0.0] * n_streams
+    squares = [0.0] * n_streams
+    history = []
+
+    try:
+        batch = 0
+        while True:
+            rule = partial(
+                monte_carlo_batch,
+                f=f,
+                bounds=bounds,
+                method=method,
+                seed=seed,
+                batch=batch,
+                batch_size=batch_size,
+            )
+            streams = range(n_streams)
+            results = executor.map(rule, streams) if executor else map(rule, streams)
+            for stream, (batch_sum, batch_squares) in enumerate(results):
+                sums[stream] += batch_sum
+                squares[stream] += batch_squares
+            batch += 1
+
+            per_stream = batch * batch_size
+            n_points = per_stream * n_streams
+            value = volume * math.fsum(sums) / n_points
+            if method == "mc":
+                mean = math.fsum(sums) / n_points
+                variance = max(0.0, math.fsum(squares) / n_points - mean * mean)
+                error = volume * math.sqrt(variance / (n_points - 1))
+            else:
+                estimates = [volume * x / per_stream for x in sums]
+                error = statistics.stdev(estimates) / math.sqrt(n_streams)
+            history.append((n_points, value, error))
+            if error <= tol or n_points + n_streams * batch_size > max_points:
+                break
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return MonteCarloResult(value, error, n_points, history)
+
+
+def gaussian(x: np.ndarray) -> np.ndarray:
+    """exp(-|x|^2) at rows of x; over [0, 1]^d integral is (sqrt(pi)/2 erf(1))^d"""
+    return np.exp(-np.sum(x * x, axis=1))
+
+
+def compare_monte_carlo(
+    dim: int = 6,
+    tol: float = 1e-5,
+    n_jobs: int = 1,
+    executor_class: Any = concurrent.futures.ThreadPoolExecutor,
+):
+    """Running estimates of all samplers on gaussian over [0, 1]^dim"""
+    exact = (math.sqrt(math.pi) / 2 * math.erf(1)) ** dim
+    rows = []
+    for method in SAMPLERS:
+        start_time = time.perf_counter()
+        result = integrate_monte_carlo(
+            gaussian,
+            [(0, 1)] * dim,
+            tol=tol,
+            method=method,
+            n_jobs=n_jobs,
+            executor_class=executor_class,
+        )
+        elapsed = time.perf_counter() - start_time
+        for n_points, value, error in result.history:
+            rows.append(
+                {
+                    "method": method,
+                    "n_points": n_points,
+                    "value": value,
+                    "error_estimate": error,
+                    "actual_error": abs(value - exact),
+                }
+            )
+        print(
+            f"{method:<7} points={result.n_points:<9} "
+            f"error estimate={result.error:.2e} "
+            f"actual={abs(result.value - exact):.2e} time={elapsed:.3f}s"
+        )
+    return pd.DataFrame(rows)
+
+
+def compare_execution_times(
+    f: Callable[[float], float] = math.cos, backend: str = "python"
+):
     cpu_num = cpu_count()
     n_jobs_range = range(1, cpu_num * 2 + 1)
     results = []
@@ -84,6 +720,7 @@ def compare_execution_times(f: Callable[[float], float] = math.cos):
             b=math.pi / 2,
             n_jobs=n_jobs,
             executor_class=concurrent.futures.ThreadPoolExecutor,
+            backend=backend,
         )
         thread_time = time.time() - start_time
 
@@ -95,6 +732,7 @@ def compare_execution_times(f: Callable[[float], float] = math.cos):
             b=math.pi / 2,
             n_jobs=n_jobs,
             executor_class=concurrent.futures.ProcessPoolExecutor,
+            backend=backend,
         )
         process_time = time.time() - start_time
 
@@ -114,12 +752,169 @@ def compare_execution_times(f: Callable[[float], float] = math.cos):
     return pd.DataFrame(results)
 
 
+def compare_adaptive(
+    f: Callable[[float], float] = math.cos,
+    a: float = 0,
+    b: float = math.pi / 2,
+    exact: float = 1.0,
+    tols: Tuple[float, ...] = (1e-6, 1e-8, 1e-10, 1e-12),
+    backend: str = "python",
+):
+    """Accuracy and evaluations of adaptive quadrature vs the Riemann sum"""
+    rows = []
+    start_time = time.perf_counter()
+    value = integrate(f, a, b, backend=backend)
+    rows.append(
+        {
+            "method": "riemann",
+            "tol": None,
+            "value": value,
+            "error_estimate": None,
+            "actual_error": abs(value - exact),
+            "n_evals": 10000000,
+            "time": time.perf_counter() - start_time,
+        }
+    )
+    for tol in tols:
+        start_time = time.perf_counter()
+        result = integrate_adaptive(f, a, b, tol=tol)
+        rows.append(
+            {
+                "method": "adaptive",
+                "tol": tol,
+                "value": result.value,
+                "error_estimate": result.error,
+                "actual_error": abs(result.value - exact),
+                "n_evals": result.n_evals,
+                "time": time.perf_counter() - start_time,
+            }
+        )
+    for row in rows:
+        print(
+            f"{row['method']:<9} tol={row['tol']!s:<6} "
+            f"error={row['actual_error']:.2e} evals={row['n_evals']:<9} "
+            f"time={row['time']:.4f}s"
+        )
+    return pd.DataFrame(rows)
+
+
+SKEW_START = 0.9 * math.pi / 2
+SKEW_REPEATS = 30
+
+
+def skewed_cost(x: float) -> float:
+    """cos(x), but SKEW_REPEATS times more expensive on the last tenth of [0, pi/2]"""
+    if x < SKEW_START:
+        return math.cos(x)
+    for _ in range(SKEW_REPEATS):
+        value = math.cos(x)
+    return value
+
+
+register_integrand("skewed_cost", skewed_cost)
+
+
+def compare_schedules(
+    f: Callable[[float], float] = skewed_cost,
+    n_jobs: int = 0,
+    n_iter: int = 1000000,
+    repeats: int = 3,
+    executor_class: Any = concurrent.futures.ProcessPoolExecutor,
+):
+    """
+    Median time of repeated integrate_parallel calls per schedule,
+    with a new executor per call and with the persistent one
+    """
+    n_jobs = n_jobs or cpu_count()
+    rows = []
+    for schedule in SCHEDULES:
+        for reuse_pool in (False, True):
+            times = []
+            for _ in range(repeats):
+                start_time = time.perf_counter()
+                value = integrate_parallel(
+                    f,
+                    0,
+                    math.pi / 2,
+                    n_jobs=n_jobs,
+                    n_iter=n_iter,
+                    executor_class=executor_class,
+                    schedule=schedule,
+                    reuse_pool=reuse_pool,
+                )
+                times.append(time.perf_counter() - start_time)
+            row = {
+                "schedule": schedule,
+                "reuse_pool": reuse_pool,
+                "n_jobs": n_jobs,
+                "n_chunks": len(make_chunks(n_iter, n_jobs, schedule)),
+                "time": statistics.median(times),
+                "value": value,
+            }
+            rows.append(row)
+            print(
+                f"{schedule:<8} reuse_pool={reuse_pool!s:<5} "
+                f"chunks={row['n_chunks']:<4} time={row['time']:.4f}s "
+                f"result={value!r}"
+            )
+    shutdown_executors()
+    return pd.DataFrame(rows)
+
+
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compare integration executors")
+    parser.add_argument(
+        "--backend",
+        choices=list(BACKENDS),
+        default="python",
+        help="Evaluate chunks by Python loop or by numpy blocks",
+    )
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="Compare adaptive quadrature with the Riemann sum instead",
+    )
+    parser.add_argument(
+        "--schedules",
+        action="store_true",
+        help="Compare chunk schedules on skewed-cost integrand instead",
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=0, help="Workers for --schedules, 0 - all CPUs"
+    )
+    parser.add_argument(
+        "--monte-carlo",
+        action="store_true",
+        help="Compare Monte Carlo and quasi-Monte Carlo samplers instead",
+    )
+    parser.add_argument(
+        "--dim", type=int, default=6, help="Dimension for --monte-carlo"
+    )
+    args = parser.parse_args()
+
     artifacts_dir = Path("artifacts") / "02_integrate"
     artifacts_dir.mkdir(exist_ok=True)
 
-    df = compare_execution_times()
-    df.to_csv(artifacts_dir / "execution_comparison.csv", index=False)
+    if args.adaptive:
+        df = compare_adaptive(backend=args.backend)
+        df.to_csv(artifacts_dir / "adaptive_comparison.csv", index=False)
+        raise SystemExit
+    if args.monte_carlo:
+        df = compare_monte_carlo(dim=args.dim, n_jobs=args.jobs or 1)
+        df.to_csv(artifacts_dir / "monte_carlo_comparison.csv", index=False)
+        raise SystemExit
+
+    if args.schedules:
+        df = compare_schedules(n_jobs=args.jobs)
+        df.to_csv(artifacts_dir / "schedule_comparison.csv", index=False)
+        raise SystemExit
+    # python backend keeps the original artifact names
+    suffix = "" if args.backend == "python" else f"_{args.backend}"
+
+    df = compare_execution_times(backend=args.backend)
+    df.to_csv(artifacts_dir / f"execution_comparison{suffix}.csv", index=False)
 
     # Plot results
     plt.figure(figsize=(10, 6))
@@ -127,8 +922,8 @@ if __name__ == "__main__":
     plt.plot(df["n_jobs"], df["process_time"], "r-", label="ProcessPoolExecutor")
     plt.xlabel("Number of workers (n_jobs)")
     plt.ylabel("Execution time (seconds)")
-    plt.title("Execution Time Comparison: Thread vs Process")
+    plt.title(f"Execution Time Comparison: Thread vs Process ({args.backend})")
     plt.legend()
     plt.grid(True)
-    plt.savefig(artifacts_dir / "execution_comparison.png")
+    plt.savefig(artifacts_dir / f"execution_comparison{suffix}.png")
     plt.close()
@@ -0,0 +1,28 @@
+import concurrent.futures
+import importlib
+import math
+import multiprocessing
+from functools import partial
+
+import pytest
+
+integrate_module = importlib.import_module("02_integrate")
+
+
+@pytest.mark.parametrize("start_method", ["fork", "spawn"])
+@pytest.mark.parametrize("f", ["x ** 2", "skewed_cost"])
+def test_integrate_parallel_processes_take_string_integrand(f, start_method):
+    executor_class = partial(
+        concurrent.futures.ProcessPoolExecutor,
+        mp_context=multiprocessing.get_context(start_method),
+    )
+    expected = integrate_module.integrate(f, 0, 1, n_iter=10000)
+    value = integrate_module.integrate_parallel(
+        f, 0, 1, n_jobs=2, n_iter=10000, executor_class=executor_class
+    )
+    assert math.isclose(value, expected, rel_tol=1e-12)
+
+
+def test_integrate_parallel_rejects_bad_expression_before_starting_pool():
+    with pytest.raises(SyntaxError):
+        integrate_module.integrate_parallel("x **", 0, 1, n_jobs=2)